@@ -0,0 +1,32 @@
+"""
+Shared pytest fixtures for the AI Trading Bot test scripts
+"""
+import asyncio
+
+import pytest
+
+# Make the bot's src/ importable once for every collected test script
+import src_path  # noqa: F401
+
+def pytest_configure(config):
+    """Register the custom markers and pick the event loop the async tests run on"""
+    config.addinivalue_line("markers", "network: fetches live market data (deselect with -m 'not network')")
+    
+    # Use uvloop's faster event loop when it is installed
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+
+@pytest.fixture(scope="session")
+def data_manager():
+    """One DataManager for the whole test session"""
+    from core.data_manager import DataManager
+    return DataManager()
+
+@pytest.fixture
+def master_agent():
+    """A fresh MasterAgent per test, since tests overwrite its trading_decisions"""
+    from agents.master_agent import MasterAgent
+    return MasterAgent()
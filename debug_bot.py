@@ -48,7 +48,7 @@ def test_step_by_step():
     try:
         import yaml
         with open("config/config.yaml", 'r') as file:
-            config = yaml.safe_load(file)
+            config = yaml.load(file, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
         print(f"   ✅ Config loaded: {len(config)} sections")
         step += 1
     except Exception as e:
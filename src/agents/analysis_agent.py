@@ -38,6 +38,9 @@ class AnalysisAgent:
             
             self.logger.info(f"Analyzing {len(tickers)} tickers", ticker_count=len(tickers))
             
+            # Cross detection for every ticker in one batched pass
+            self.data_manager.precompute_rule_crosses(tickers)
+            
             # Analyze each ticker
             analysis_results = {}
             for ticker in tickers:
@@ -3,13 +3,14 @@ Master Agent for coordinating analysis, news, and making final trading decisions
 """
 import asyncio
 import os
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 import json
 import pandas as pd
 from agents.analysis_agent import AnalysisAgent
 from agents.news_agent import NewsAgent
 from utils.logger import trading_logger
+from utils.cached_loader import load_yaml, load_json
 from utils.email_sender import EmailSender
 from utils.position_manager import PositionManager
 from utils.enhanced_nymo import EnhancedNYMO
@@ -77,10 +78,7 @@ class MasterAgent:
     def _load_config(self, config_path: str) -> Dict:
         """Load configuration"""
         try:
-            import yaml
-            with open(config_path, 'r') as file:
-                config = yaml.safe_load(file)
-            return config
+            return load_yaml(config_path)
         except Exception as e:
             self.logger.error("Error loading config", error=str(e))
             return {}
@@ -102,7 +100,8 @@ class MasterAgent:
             analysis_task = asyncio.create_task(self.analysis_agent.analyze_all_tickers())
             news_task = asyncio.create_task(self.news_agent.analyze_news_for_tickers(tickers))
             
-            # Execute enhanced NYMO analysis
+            # Execute enhanced NYMO analysis; it is reported alongside the signals and does not
+            # adjust their confidence, since its breadth data is still simulated
             nymo_task = asyncio.create_task(self.enhanced_nymo.analyze_market_conditions())
             
             # Wait for all tasks to complete
@@ -121,10 +120,6 @@ class MasterAgent:
                 self.logger.error("Enhanced NYMO failed", error=str(nymo_results))
                 nymo_results = {}
             
-            # Integrate NYMO signals into analysis
-            if nymo_results and not isinstance(nymo_results, Exception):
-                analysis_results = self._integrate_nymo_signals(analysis_results, nymo_results)
-            
             # Store results for reporting
             self.last_analysis_results = analysis_results
             self.last_news_results = news_results
@@ -139,36 +134,61 @@ class MasterAgent:
         except Exception as e:
             self.logger.error("Error in comprehensive analysis", error=str(e))
             return {}
-            
-            # Wait for both tasks to complete
-            analysis_results, news_results = await asyncio.gather(analysis_task, news_task)
-            
-            # Generate trading decisions
-            trading_decisions = await self._generate_trading_decisions(analysis_results, news_results)
-            
-            # Update agent state
-            self.last_decision_time = datetime.now()
-            self.trading_decisions = trading_decisions
-            self.last_analysis_results = analysis_results
-            self.last_news_results = news_results
-            
-            # Display results in table format
-            self._display_results_table(analysis_results, news_results, trading_decisions)
-            
-            self.logger.info("Comprehensive analysis execution completed", 
-                           total_tickers=len(tickers),
-                           decisions_generated=len(trading_decisions))
-            
-            return {
-                'analysis_results': analysis_results,
-                'news_results': news_results,
-                'trading_decisions': trading_decisions,
-                'execution_timestamp': datetime.now().isoformat()
-            }
-            
-        except Exception as e:
-            self.logger.error("Error in comprehensive analysis execution", error=str(e))
-            return {}
+    
+    async def execute_comprehensive_analysis_iter(self, max_concurrency: int = 8) -> AsyncIterator[Tuple[str, List[Dict], Dict]]:
+        """Analyze every ticker, yielding (ticker, signals, news) as each one completes"""
+        tickers = self.analysis_agent.data_manager.get_all_tickers()
+        if not tickers:
+            self.logger.warning("No tickers found for analysis")
+            return
+        
+        self.logger.info(f"Streaming analysis for {len(tickers)} tickers", ticker_count=len(tickers))
+        
+        # Cross detection for every ticker in one batched pass, as analyze_all_tickers does
+        self.analysis_agent.data_manager.precompute_rule_crosses(tickers)
+        
+        # Bound concurrent tickers so news fetches stay inside API rate limits
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def analyze(ticker: str) -> Tuple[str, List[Dict], Dict]:
+            async with semaphore:
+                signals, news = await asyncio.gather(
+                    self.analysis_agent.analyze_ticker(ticker),
+                    self.news_agent.analyze_ticker_news(ticker),
+                    return_exceptions=True
+                )
+            # One failing ticker must not end the stream for the others
+            if isinstance(signals, Exception):
+                self.logger.error(f"Error analyzing {ticker}", error=str(signals), ticker=ticker)
+                signals = []
+            if isinstance(news, Exception):
+                self.logger.error(f"Error analyzing news for {ticker}", error=str(news), ticker=ticker)
+                news = {}
+            return ticker, signals or [], news or {}
+        
+        tasks = [asyncio.create_task(analyze(ticker)) for ticker in tickers]
+        analysis_results = {}
+        news_results = {}
+        try:
+            for completed in asyncio.as_completed(tasks):
+                ticker, signals, news = await completed
+                if signals:
+                    analysis_results[ticker] = signals
+                if news:
+                    news_results[ticker] = news
+                yield ticker, signals, news
+        finally:
+            # Cancel stragglers if the consumer stops early
+            for task in tasks:
+                task.cancel()
+        
+        # Store results for reporting, like execute_comprehensive_analysis
+        self.last_analysis_results = analysis_results
+        self.last_news_results = news_results
+        
+        self.logger.info("Streaming analysis completed", 
+                       total_tickers=len(tickers),
+                       tickers_with_signals=len(analysis_results))
     
     def _display_results_table(self, analysis_results: Dict, news_results: Dict, trading_decisions: Dict):
         """Display analysis results in a formatted table"""
@@ -334,9 +354,7 @@ class MasterAgent:
         """Get purchase limit percentage from rules for a ticker"""
         try:
             # Load trading rules
-            rules_path = "rules.json"
-            with open(rules_path, 'r') as file:
-                rules_data = json.load(file)
+            rules_data = load_json("rules.json")
             
             # Find the rule that matches the rule_name
             for rule in rules_data.get('rules', []):
@@ -1030,17 +1048,16 @@ Respond only with valid JSON.
             
             for ticker in sorted(all_tickers):
                 # Get analysis data for this ticker
-                analysis_data = getattr(self, 'last_analysis_results', {}).get(ticker, {})
+                analysis_data = getattr(self, 'last_analysis_results', {}).get(ticker, [])
                 news_data = getattr(self, 'last_news_results', {}).get(ticker, {})
                 decision = self.trading_decisions.get(ticker, {})
                 
                 # Format technical signals
                 tech_signals = "None"
                 if analysis_data:
-                    signals = analysis_data.get('signals', [])
-                    if signals:
-                        primary_signal = signals[0]
-                        tech_signals = primary_signal.get('rule_name', 'Unknown')[:20]
+                    # Analysis results map each ticker to its signal list
+                    primary_signal = analysis_data[0]
+                    tech_signals = primary_signal.get('rule_name', 'Unknown')[:20]
                 
                 # Format sentiment score
                 sentiment_score = "No News"
@@ -7,6 +7,7 @@ from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta, timezone
 import requests
 from utils.logger import trading_logger
+from utils.cached_loader import load_yaml
 from utils.email_sender import EmailSender
 
 class NewsAgent:
@@ -52,10 +53,7 @@ class NewsAgent:
     def _load_config(self, config_path: str) -> Dict:
         """Load configuration"""
         try:
-            import yaml
-            with open(config_path, 'r') as file:
-                config = yaml.safe_load(file)
-            return config
+            return load_yaml(config_path)
         except Exception as e:
             self.logger.error("Error loading config", error=str(e))
             return {}
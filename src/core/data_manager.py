@@ -1,15 +1,23 @@
 """
 Data Manager for handling market data and technical indicators
 """
-import json
+import hashlib
 import os
 import pandas as pd
+from importlib.util import find_spec
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 from alpha_vantage.timeseries import TimeSeries
 from utils.logger import trading_logger
+from utils.cached_loader import CACHE_DIR, load_yaml, load_json
 from utils.technical_indicators import TechnicalIndicators
 
+# Market data is cached in a binary columnar format: Feather when pyarrow is installed, pickle otherwise
+_HAS_PYARROW = find_spec("pyarrow") is not None
+_CACHE_EXT = '.feather' if _HAS_PYARROW else '.df.pkl'
+# Every market data cache format, including files from older runs, so cleanup removes them all
+_ALL_CACHE_EXTS = ('.feather', '.df.pkl', '.csv')
+
 class DataManager:
     """Manages market data and technical indicators"""
     
@@ -29,17 +37,14 @@ class DataManager:
         self.indicators_cache = {}
         self.data_cache = {}
         
-        # CSV cache directory
-        self.csv_cache_dir = "data_cache"
+        # Market data cache directory, shared with the parsed config/rules sidecars in the project root
+        self.cache_dir = CACHE_DIR
         self._ensure_cache_directory()
         
     def _load_config(self, config_path: str) -> Dict:
         """Load configuration"""
         try:
-            import yaml
-            with open(config_path, 'r') as file:
-                config = yaml.safe_load(file)
-            return config
+            return load_yaml(config_path)
         except Exception as e:
             self.logger.error("Error loading config", error=str(e))
             return {}
@@ -47,8 +52,7 @@ class DataManager:
     def _load_trading_rules(self) -> Dict:
         """Load trading rules from rules.json"""
         try:
-            with open("rules.json", 'r') as file:
-                rules = json.load(file)
+            rules = load_json("rules.json")
             self.logger.info("Trading rules loaded successfully", rules_count=len(rules.get('rules', [])))
             return rules
         except Exception as e:
@@ -56,21 +60,22 @@ class DataManager:
             return {'rules': []}
     
     def _ensure_cache_directory(self):
-        """Ensure the CSV cache directory exists"""
+        """Ensure the data cache directory exists"""
         try:
-            if not os.path.exists(self.csv_cache_dir):
-                os.makedirs(self.csv_cache_dir)
-                self.logger.info(f"Created cache directory: {self.csv_cache_dir}")
+            if not os.path.exists(self.cache_dir):
+                os.makedirs(self.cache_dir)
+                self.logger.info(f"Created cache directory: {self.cache_dir}")
         except Exception as e:
             self.logger.error(f"Error creating cache directory", error=str(e))
     
-    def _get_csv_cache_path(self, ticker: str, period: str, interval: str) -> str:
-        """Get the CSV cache file path for a ticker and timeframe"""
+    def _cache_path(self, ticker: str, period: str, interval: str) -> str:
+        """Get the cache file path for a ticker and timeframe"""
         safe_ticker = ticker.replace('/', '_').replace('\\', '_')  # Safe filename
-        return os.path.join(self.csv_cache_dir, f"{safe_ticker}_{period}_{interval}.csv")
+        key = hashlib.blake2b(f"{ticker}|{period}|{interval}".encode(), digest_size=8).hexdigest()
+        return os.path.join(self.cache_dir, f"{safe_ticker}_{key}{_CACHE_EXT}")
     
     def _is_cache_valid(self, cache_path: str) -> bool:
-        """Check if CSV cache is still valid (same day)"""
+        """Check if a data cache file is still valid (same day)"""
         try:
             if not os.path.exists(cache_path):
                 return False
@@ -84,35 +89,45 @@ class DataManager:
             self.logger.error(f"Error checking cache validity", error=str(e))
             return False
     
-    def _load_from_csv_cache(self, cache_path: str) -> Optional[pd.DataFrame]:
-        """Load data from CSV cache"""
+    def _load_from_cache(self, cache_path: str) -> Optional[pd.DataFrame]:
+        """Load data from the data cache"""
         try:
             if not os.path.exists(cache_path):
                 return None
             
-            data = pd.read_csv(cache_path, index_col=0, parse_dates=True)
-            self.logger.debug(f"Loaded data from CSV cache: {cache_path}")
+            if _HAS_PYARROW:
+                frame = pd.read_feather(cache_path)
+                data = frame.set_index(frame.columns[0])
+                if data.index.name == 'index':
+                    data.index.name = None  # reset_index() named the unnamed date index on save
+            else:
+                data = pd.read_pickle(cache_path)
+            self.logger.debug(f"Loaded data from the data cache: {cache_path}")
             return data
             
         except Exception as e:
-            self.logger.error(f"Error loading from CSV cache", error=str(e))
+            self.logger.error(f"Error loading from the data cache", error=str(e))
             return None
     
-    def _save_to_csv_cache(self, data: pd.DataFrame, cache_path: str):
-        """Save data to CSV cache"""
+    def _save_to_cache(self, data: pd.DataFrame, cache_path: str):
+        """Save data to the data cache"""
         try:
-            data.to_csv(cache_path)
-            self.logger.debug(f"Saved data to CSV cache: {cache_path}")
+            if _HAS_PYARROW:
+                # Feather stores a default index only, so the date index is kept as the first column
+                data.reset_index().to_feather(cache_path)
+            else:
+                data.to_pickle(cache_path)
+            self.logger.debug(f"Saved data to the data cache: {cache_path}")
         except Exception as e:
-            self.logger.error(f"Error saving to CSV cache", error=str(e))
+            self.logger.error(f"Error saving to the data cache", error=str(e))
     
     def _cleanup_old_cache_files(self):
-        """Clean up CSV cache files older than 1 day"""
+        """Clean up data cache files older than 1 day"""
         try:
             today = datetime.now().date()
-            for filename in os.listdir(self.csv_cache_dir):
-                if filename.endswith('.csv'):
-                    file_path = os.path.join(self.csv_cache_dir, filename)
+            for filename in os.listdir(self.cache_dir):
+                if filename.endswith(_ALL_CACHE_EXTS):
+                    file_path = os.path.join(self.cache_dir, filename)
                     file_time = datetime.fromtimestamp(os.path.getmtime(file_path))
                     
                     if file_time.date() < today:
@@ -140,15 +155,15 @@ class DataManager:
     
     def fetch_market_data(self, ticker: str, period: str = 'D', 
                           interval: str = '365d') -> Optional[pd.DataFrame]:
-        """Fetch market data for a ticker using Alpha Vantage with CSV caching"""
+        """Fetch market data for a ticker using Alpha Vantage with data caching"""
         try:
-            # Get CSV cache path
-            csv_cache_path = self._get_csv_cache_path(ticker, period, interval)
+            # Get data cache path
+            cache_path = self._cache_path(ticker, period, interval)
             
-            # Check if CSV cache is valid (same day)
-            if self._is_cache_valid(csv_cache_path):
-                self.logger.info(f"Using CSV cache for {ticker}", ticker=ticker)
-                data = self._load_from_csv_cache(csv_cache_path)
+            # Check if the data cache is valid (same day)
+            if self._is_cache_valid(cache_path):
+                self.logger.info(f"Using data cache for {ticker}", ticker=ticker)
+                data = self._load_from_cache(cache_path)
                 if data is not None:
                     # Also update in-memory cache
                     cache_key = f"{ticker}_{period}_{interval}"
@@ -166,8 +181,8 @@ class DataManager:
             if not self.alpha_vantage_ts:
                 self.logger.warning("Alpha Vantage not configured, using mock data", ticker=ticker)
                 mock_data = self._generate_mock_data(ticker, period, interval)
-                # Save mock data to CSV for consistency
-                self._save_to_csv_cache(mock_data, csv_cache_path)
+                # Save mock data to the data cache for consistency
+                self._save_to_cache(mock_data, cache_path)
                 return mock_data
             
             # Fetch new data from Alpha Vantage
@@ -208,11 +223,11 @@ class DataManager:
                 if data.empty:
                     self.logger.warning(f"No data received for {ticker}", ticker=ticker, period=period)
                     mock_data = self._generate_mock_data(ticker, period, interval)
-                    self._save_to_csv_cache(mock_data, csv_cache_path)
+                    self._save_to_cache(mock_data, cache_path)
                     return mock_data
                 
-                # Save to CSV cache
-                self._save_to_csv_cache(data, csv_cache_path)
+                # Save to the data cache
+                self._save_to_cache(data, cache_path)
                 
                 # Update in-memory cache
                 cache_key = f"{ticker}_{period}_{interval}"
@@ -230,15 +245,15 @@ class DataManager:
                 self.logger.warning(f"Alpha Vantage API error for {ticker}, using mock data", 
                                   error=str(e), ticker=ticker)
                 mock_data = self._generate_mock_data(ticker, period, interval)
-                self._save_to_csv_cache(mock_data, csv_cache_path)
+                self._save_to_cache(mock_data, cache_path)
                 return mock_data
             
         except Exception as e:
             self.logger.error(f"Error fetching market data for {ticker}", 
                             error=str(e), ticker=ticker, period=period)
             mock_data = self._generate_mock_data(ticker, period, interval)
-            csv_cache_path = self._get_csv_cache_path(ticker, period, interval)
-            self._save_to_csv_cache(mock_data, csv_cache_path)
+            cache_path = self._cache_path(ticker, period, interval)
+            self._save_to_cache(mock_data, cache_path)
             return mock_data
     
     def calculate_indicators_for_ticker(self, ticker: str, period: str = 'D', 
@@ -248,8 +263,8 @@ class DataManager:
             cache_key = f"{ticker}_{period}_{interval}_indicators"
             
             # Check cache first
-            if cache_key in self.indicators_cache:
-                cached_indicators = self.indicators_cache[cache_key]
+            cached_indicators = self.indicators_cache.get(cache_key)
+            if cached_indicators is not None:
                 # Check if cache is still valid (less than 30 minutes old)
                 if datetime.now() - cached_indicators.get('timestamp', datetime.min) < timedelta(minutes=30):
                     self.logger.debug(f"Using cached indicators for {ticker}", ticker=ticker)
@@ -260,12 +275,20 @@ class DataManager:
             if data is None:
                 return None
             
+            # An expired entry is still good if no bar has been added or revised since it was computed
+            last_bar = (len(data), data.index[-1], data['close'].iloc[-1]) if len(data) else None
+            if cached_indicators is not None and cached_indicators.get('last_bar') == last_bar:
+                cached_indicators['timestamp'] = datetime.now()
+                self.logger.debug(f"Market data unchanged, reusing indicators for {ticker}", ticker=ticker)
+                return cached_indicators['indicators']
+            
             indicators = self.technical_indicators.calculate_all_indicators(data, ticker, period)
             
             # Cache the indicators
             self.indicators_cache[cache_key] = {
                 'indicators': indicators,
-                'timestamp': datetime.now()
+                'timestamp': datetime.now(),
+                'last_bar': last_bar
             }
             
             self.logger.info(f"Calculated indicators for {ticker}", 
@@ -278,6 +301,24 @@ class DataManager:
                             error=str(e), ticker=ticker, period=period)
             return None
     
+    def precompute_rule_crosses(self, tickers: List[str]):
+        """Prime rule snapshots for all tickers in one batched cross pass"""
+        try:
+            indicator_sets = {}
+            for ticker in tickers:
+                for rule in self.get_ticker_rules(ticker):
+                    period = rule.get('period', 'D')
+                    if (ticker, period) in indicator_sets:
+                        continue
+                    indicators = self.calculate_indicators_for_ticker(ticker, period, rule.get('interval', '365d'))
+                    if indicators is not None:
+                        indicator_sets[(ticker, period)] = indicators
+            
+            self.technical_indicators.precompute_crosses_batch(indicator_sets)
+            
+        except Exception as e:
+            self.logger.error("Error precomputing rule crosses", error=str(e))
+    
     def evaluate_all_rules_for_ticker(self, ticker: str) -> List[Dict]:
         """Evaluate all trading rules for a ticker"""
         try:
@@ -446,48 +487,48 @@ class DataManager:
         self.logger.info("In-memory cache cleared")
     
     def clear_csv_cache(self):
-        """Clear all CSV cache files"""
+        """Clear all data cache files"""
         try:
-            for filename in os.listdir(self.csv_cache_dir):
-                if filename.endswith('.csv'):
-                    file_path = os.path.join(self.csv_cache_dir, filename)
+            for filename in os.listdir(self.cache_dir):
+                if filename.endswith(_ALL_CACHE_EXTS):
+                    file_path = os.path.join(self.cache_dir, filename)
                     os.remove(file_path)
-                    self.logger.info(f"Removed CSV cache file: {filename}")
-            self.logger.info("CSV cache cleared")
+                    self.logger.info(f"Removed data cache file: {filename}")
+            self.logger.info("Data cache cleared")
         except Exception as e:
-            self.logger.error(f"Error clearing CSV cache", error=str(e))
+            self.logger.error(f"Error clearing data cache", error=str(e))
     
     def clear_ticker_csv_cache(self, ticker: str):
-        """Clear CSV cache for a specific ticker"""
+        """Clear data cache for a specific ticker"""
         try:
-            for filename in os.listdir(self.csv_cache_dir):
-                if filename.startswith(f"{ticker}_") and filename.endswith('.csv'):
-                    file_path = os.path.join(self.csv_cache_dir, filename)
+            for filename in os.listdir(self.cache_dir):
+                if filename.startswith(f"{ticker}_") and filename.endswith(_ALL_CACHE_EXTS):
+                    file_path = os.path.join(self.cache_dir, filename)
                     os.remove(file_path)
-                    self.logger.info(f"Removed CSV cache file for {ticker}: {filename}")
+                    self.logger.info(f"Removed data cache file for {ticker}: {filename}")
         except Exception as e:
-            self.logger.error(f"Error clearing CSV cache for {ticker}", error=str(e))
+            self.logger.error(f"Error clearing data cache for {ticker}", error=str(e))
     
     def get_cache_stats(self) -> Dict:
         """Get cache statistics"""
         try:
-            csv_files = [f for f in os.listdir(self.csv_cache_dir) if f.endswith('.csv')]
-            csv_cache_size = len(csv_files)
+            cache_files = [f for f in os.listdir(self.cache_dir) if f.endswith(_CACHE_EXT)]
+            cache_file_count = len(cache_files)
             
-            # Calculate total CSV cache size in MB
-            total_csv_size_mb = 0
-            for filename in csv_files:
-                file_path = os.path.join(self.csv_cache_dir, filename)
+            # Calculate total data cache size in MB
+            total_cache_size_mb = 0
+            for filename in cache_files:
+                file_path = os.path.join(self.cache_dir, filename)
                 if os.path.exists(file_path):
-                    total_csv_size_mb += os.path.getsize(file_path) / (1024 * 1024)
+                    total_cache_size_mb += os.path.getsize(file_path) / (1024 * 1024)
             
             return {
                 'indicators_cache_size': len(self.indicators_cache),
                 'data_cache_size': len(self.data_cache),
                 'total_memory_cache_size': len(self.indicators_cache) + len(self.data_cache),
-                'csv_cache_files_count': csv_cache_size,
-                'csv_cache_total_size_mb': round(total_csv_size_mb, 2),
-                'csv_cache_directory': self.csv_cache_dir
+                'csv_cache_files_count': cache_file_count,
+                'csv_cache_total_size_mb': round(total_cache_size_mb, 2),
+                'csv_cache_directory': self.cache_dir
             }
         except Exception as e:
             self.logger.error(f"Error getting cache stats", error=str(e))
@@ -497,5 +538,5 @@ class DataManager:
                 'total_memory_cache_size': len(self.indicators_cache) + len(self.data_cache),
                 'csv_cache_files_count': 0,
                 'csv_cache_total_size_mb': 0,
-                'csv_cache_directory': self.csv_cache_dir
+                'csv_cache_directory': self.cache_dir
             }
@@ -23,6 +23,7 @@ sys.path.append(str(Path(__file__).parent))
 
 from agents.master_agent import MasterAgent
 from utils.logger import trading_logger
+from utils.cached_loader import load_yaml
 from utils.email_sender import EmailSender
 
 class AITradingBot:
@@ -46,10 +47,7 @@ class AITradingBot:
     def _load_config(self):
         """Load configuration"""
         try:
-            import yaml
-            with open(self.config_path, 'r') as file:
-                config = yaml.safe_load(file)
-            return config
+            return load_yaml(self.config_path)
         except Exception as e:
             self.logger.error("Error loading config", error=str(e))
             return {}
@@ -135,9 +133,12 @@ class AITradingBot:
                 # Send summary email even if no results
                 self.logger.info("Sending summary email...")
                 await self.master_agent.send_trading_report()
+            
+            return bool(results)
                 
         except Exception as e:
             self.logger.error("Error in market analysis", error=str(e))
+            return False
     
     async def _handle_trade_execution(self, trading_decisions: Dict):
         """Handle trade execution based on user preference"""
@@ -0,0 +1,70 @@
+"""
+Cached loading of configuration and rules files for the AI Trading Bot
+"""
+import hashlib
+import json
+import os
+import pickle
+from typing import Any, Callable, TextIO
+
+import yaml
+
+try:
+    import orjson
+except ImportError:  # Optional, the stdlib parser is used without it
+    orjson = None
+
+# Parsed files are pickled here, in the project root's data_cache whatever the working directory
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "data_cache")
+
+def _sidecar_path(path: str) -> str:
+    """Pickle sidecar location for a source file"""
+    digest = hashlib.sha1(os.path.abspath(path).encode()).hexdigest()
+    return os.path.join(CACHE_DIR, f"{digest}.pkl")
+
+def _load_cached(path: str, parse: Callable[[TextIO], Any]) -> Any:
+    """Load a parsed file from its pickle sidecar, reparsing only when the source has changed"""
+    stat = os.stat(path)
+    header = (stat.st_mtime_ns, stat.st_size)
+    sidecar = _sidecar_path(path)
+
+    try:
+        with open(sidecar, 'rb') as file:
+            cached_header, obj = pickle.load(file)
+        if cached_header == header:
+            return obj
+    except Exception:
+        pass  # Missing or unreadable sidecar, parse the source below
+
+    with open(path, 'r') as file:
+        obj = parse(file)
+
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        # Write to a temporary file first so a concurrent reader never sees a partial pickle
+        tmp_path = f"{sidecar}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as file:
+            pickle.dump((header, obj), file, protocol=5)
+        os.replace(tmp_path, sidecar)
+    except OSError:
+        pass  # Caching is best effort
+
+    return obj
+
+def _parse_yaml(file: TextIO) -> Any:
+    """Parse YAML with libyaml when available"""
+    return yaml.load(file, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
+
+def _parse_json(file: TextIO) -> Any:
+    """Parse JSON with orjson when available"""
+    if orjson is not None:
+        return orjson.loads(file.read())
+    return json.load(file)
+
+def load_yaml(path: str) -> Any:
+    """Load a YAML file, reusing the cached parse while the file is unchanged"""
+    return _load_cached(path, _parse_yaml)
+
+def load_json(path: str) -> Any:
+    """Load a JSON file, reusing the cached parse while the file is unchanged"""
+    return _load_cached(path, _parse_json)
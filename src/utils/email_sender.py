@@ -10,7 +10,7 @@ from email import encoders
 from typing import List, Dict, Optional
 import pandas as pd
 from datetime import datetime
-import yaml
+from utils.cached_loader import load_yaml
 
 class EmailSender:
     """Email sender for trading bot notifications"""
@@ -26,9 +26,7 @@ class EmailSender:
     def _load_config(self, config_path: str) -> Dict:
         """Load configuration from YAML file"""
         try:
-            with open(config_path, 'r') as file:
-                config = yaml.safe_load(file)
-            return config
+            return load_yaml(config_path)
         except Exception as e:
             print(f"Error loading config: {e}")
             return {}
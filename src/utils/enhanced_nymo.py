@@ -309,6 +309,34 @@ class EnhancedNYMO:
                 'risk_level': 'unknown'
             }
     
+    async def analyze_market_conditions(self) -> Dict:
+        """
+        Analyze current market conditions from today's NYMO
+        
+        Returns:
+            Dict with the NYMO value, market condition and signal details
+        """
+        try:
+            market_data = self.fetch_market_breadth_data()
+            if not market_data:
+                return {}
+            
+            nymo_value = self.calculate_enhanced_nymo(market_data)
+            signals = self.calculate_nymo_signals(nymo_value)
+            
+            return {
+                'nymo_value': nymo_value,
+                'market_condition': signals.get('signal_strength', 'neutral'),
+                'signals': signals,
+                'market_breadth': market_data,
+                'timestamp': datetime.now().isoformat()
+            }
+            
+        except Exception as e:
+            if self.logger:
+                self.logger.error("Error analyzing market conditions", error=str(e))
+            return {}
+    
     def get_nymo_history(self, days: int = 30) -> List[Dict]:
         """
         Get NYMO history for analysis
@@ -0,0 +1,30 @@
+"""
+Parse-once loading of the .env file for the AI Trading Bot
+"""
+import os
+from typing import Dict, Optional, Tuple
+
+from dotenv import dotenv_values
+
+# Last parse of the .env file, keyed by its (mtime_ns, size)
+_cached_key: Optional[Tuple[int, int]] = None
+_cached_values: Dict[str, Optional[str]] = {}
+
+def load_env_once(path: str = ".env") -> bool:
+    """Load a .env file into os.environ, reparsing it only when the file has changed"""
+    global _cached_key, _cached_values
+
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return False  # No .env file, same as load_dotenv()
+
+    key = (stat.st_mtime_ns, stat.st_size)
+    if key != _cached_key:
+        _cached_values = dotenv_values(path)
+        _cached_key = key
+
+    # Like load_dotenv(), variables already set in the environment take precedence
+    os.environ.update({name: value for name, value in _cached_values.items()
+                       if value is not None and name not in os.environ})
+    return True
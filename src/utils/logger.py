@@ -15,6 +15,7 @@ class TradingBotLogger:
     def __init__(self, log_level: str = "INFO", log_file: Optional[str] = None):
         self.log_level = getattr(logging, log_level.upper())
         self.log_file = log_file or "logs/trading_bot.log"
+        self._loggers = {}  # Component name -> logger, built once per name
         
         # Create logs directory if it doesn't exist
         Path(self.log_file).parent.mkdir(parents=True, exist_ok=True)
@@ -68,8 +69,11 @@ class TradingBotLogger:
         root_logger.propagate = False
         
     def get_logger(self, name: str):
-        """Get a logger instance for a specific component"""
-        return structlog.get_logger(name)
+        """Get a logger instance for a specific component, reusing it on later calls"""
+        logger = self._loggers.get(name)
+        if logger is None:
+            logger = self._loggers[name] = structlog.get_logger(name)
+        return logger
     
     def log_trade_signal(self, ticker: str, signal: str, confidence: float, 
                          reasoning: str, agent: str):
@@ -71,6 +71,61 @@ class PositionManager:
                 self.logger.error(f"Error calculating ATR position size", error=str(e))
             return {}
     
+    def calculate_atr_position_sizes(self, portfolio_values, current_prices,
+                                     atr_values, purchase_limit_pcts) -> Dict:
+        """
+        Vectorized calculate_atr_position_size over arrays of sizing inputs
+        
+        Args:
+            portfolio_values: Total portfolio values
+            current_prices: Current stock prices
+            atr_values: Current ATR values
+            purchase_limit_pcts: Maximum percentages of portfolio allowed
+            
+        Returns:
+            Dict with the same keys as calculate_atr_position_size, each holding an array
+        """
+        try:
+            portfolio_values, current_prices, atr_values, purchase_limit_pcts = np.broadcast_arrays(
+                *(np.asarray(values, dtype=np.float64)
+                  for values in (portfolio_values, current_prices, atr_values, purchase_limit_pcts))
+            )
+            
+            # Rows the scalar method cannot size (zero, negative or missing price or portfolio) get 0 shares
+            valid = (np.isfinite(current_prices) & (current_prices > 0) &
+                     np.isfinite(portfolio_values) & (portfolio_values > 0))
+            
+            with np.errstate(divide='ignore', invalid='ignore'):
+                # Same arithmetic as the scalar method, one array operation per step
+                atr_position_value = portfolio_values * (atr_values / current_prices)
+                atr_position_pct = np.where(valid, (atr_position_value / portfolio_values) * 100, 0.0)
+                limit_position_value = portfolio_values * (purchase_limit_pcts / 100)
+                
+                # Use whichever is smaller
+                use_atr = atr_position_pct <= purchase_limit_pcts
+                final_position_value = np.where(use_atr, atr_position_value, limit_position_value)
+                
+                # Truncate like int() in the scalar method
+                shares = np.where(valid, np.trunc(final_position_value / current_prices), 0).astype(np.int64)
+                actual_position_value = np.where(valid, shares * current_prices, 0.0)
+                position_pct = np.where(valid, (actual_position_value / portfolio_values) * 100, 0.0)
+            
+            return {
+                'shares': shares,
+                'position_value': actual_position_value,
+                'position_pct': position_pct,
+                'sizing_method': np.where(use_atr, "ATR-based", "Limit-based"),
+                'atr_position_pct': atr_position_pct,
+                'limit_position_pct': purchase_limit_pcts,
+                'atr_value': atr_values,
+                'current_price': current_prices
+            }
+            
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"Error calculating ATR position sizes", error=str(e))
+            return {}
+    
     def should_average_down(self, ticker: str, current_price: float, 
                            entry_price: float, atr_value: float, 
                            pct_below_previous_buy: float) -> Tuple[bool, float, str]:
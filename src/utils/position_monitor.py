@@ -3,10 +3,17 @@ Automated Position Monitoring and Management
 Continuously monitors positions and executes management actions
 """
 import asyncio
+import operator
 import time
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from typing import Dict, List, Optional, Tuple
-import pandas as pd
+import numpy as np
+
+# Fetch every field we track from an Alpaca position in one C-level call
+_get_pos_fields = operator.attrgetter(
+    'symbol', 'qty', 'avg_entry_price', 'current_price',
+    'market_value', 'unrealized_pl', 'unrealized_plpc'
+)
 
 class PositionMonitor:
     """Automated position monitoring and management"""
@@ -24,10 +31,31 @@ class PositionMonitor:
         self.max_positions_per_ticker = config.get('trading', {}).get('monitoring', {}).get('max_positions_per_ticker', 3)
         self.rebalance_threshold = config.get('trading', {}).get('monitoring', {}).get('rebalance_threshold', 0.1)
         
+        # Sell thresholds (fractions), read once rather than per ticker per tick
+        sell_conditions = config.get('trading', {}).get('sell_conditions', {})
+        self._extended_thresh = sell_conditions.get('extended_from_200sma_pct', 15) / 100
+        self._profit_thresh = sell_conditions.get('profit_taking_pct', 50) / 100
+        self._stop_loss_thresh = sell_conditions.get('stop_loss_pct', 25) / 100
+        
         # Position tracking
         self.positions = {}
+        # Columnar (SoA) view of the same positions for vectorized checks
+        self._pos_dtype = np.dtype([
+            ('shares', 'i8'),
+            ('entry_price', 'f8'),
+            ('current_price', 'f8'),
+            ('market_value', 'f8'),
+            ('unrealized_pl', 'f8'),
+            ('unrealized_pl_pct', 'f8'),
+            ('last_updated', 'datetime64[us]'),
+        ])
+        self._pos_arr = np.empty(0, dtype=self._pos_dtype)
+        self._pos_index = {}
+        self._pos_tickers = []
         self.last_check_time = None
         self.management_history = []
+        self._today_date = date.today()
+        self._today_actions = 0
         
     async def start_monitoring(self):
         """Start automated position monitoring"""
@@ -60,22 +88,36 @@ class PositionMonitor:
         
     async def _monitoring_loop(self):
         """Main monitoring loop"""
+        # Resolve hot-path callables once instead of on every tick
+        check = self._check_positions
+        execute = self._execute_management_actions
+        sleep = asyncio.sleep
+        now = datetime.now
+        monotonic = time.monotonic
+        log_error = self.logger.error
+        interval = self.check_interval * 60
+        
         while self.running:
             try:
-                await self._check_positions()
-                await self._execute_management_actions()
+                # Single wall-clock read per tick, shared by every position/action
+                tick_now = now()
+                tick_start = monotonic()
+                await check(tick_now)
+                await execute(tick_now)
                 
-                # Wait for next check
-                await asyncio.sleep(self.check_interval * 60)
+                # Wait for next check (monotonic clock, so the cadence excludes tick work)
+                await sleep(max(0.0, interval - (monotonic() - tick_start)))
                 
             except asyncio.CancelledError:
                 break
             except Exception as e:
-                self.logger.error("Error in monitoring loop", error=str(e))
-                await asyncio.sleep(60)  # Wait 1 minute before retrying
+                log_error("Error in monitoring loop", error=str(e))
+                await sleep(60)  # Wait 1 minute before retrying
     
-    async def _check_positions(self):
+    async def _check_positions(self, tick_now: Optional[datetime] = None):
         """Check current positions and update tracking"""
+        if tick_now is None:
+            tick_now = datetime.now()
         try:
             self.logger.info("Checking current positions")
             
@@ -84,174 +126,222 @@ class PositionMonitor:
                 self.logger.warning("Alpaca client not available")
                 return
             
-            positions = self.master_agent.alpaca_client.list_positions()
+            positions = [_get_pos_fields(position)
+                         for position in self.master_agent.alpaca_client.list_positions()]
+            
+            # Parse all positions into one structured record array
+            tickers = [fields[0] for fields in positions]
+            pos_arr = np.fromiter(
+                ((int(qty), float(avg), float(cur), float(mv), float(pl), float(plpc), tick_now)
+                 for _, qty, avg, cur, mv, pl, plpc in positions),
+                dtype=self._pos_dtype,
+                count=len(positions)
+            )
             
             # Update position tracking
-            current_positions = {}
-            for position in positions:
-                ticker = position.symbol
-                current_positions[ticker] = {
-                    'symbol': ticker,
-                    'shares': int(position.qty),
-                    'entry_price': float(position.avg_entry_price),
-                    'current_price': float(position.current_price),
-                    'market_value': float(position.market_value),
-                    'unrealized_pl': float(position.unrealized_pl),
-                    'unrealized_pl_pct': float(position.unrealized_plpc),
-                    'last_updated': datetime.now()
-                }
+            fields = self._pos_dtype.names
+            current_positions = {
+                ticker: {'symbol': ticker, **dict(zip(fields, row))}
+                for ticker, row in zip(tickers, pos_arr.tolist())
+            }
             
             # Check for position changes
-            self._detect_position_changes(current_positions)
+            self._detect_position_changes(tickers, pos_arr)
             
             # Update tracking
             self.positions = current_positions
-            self.last_check_time = datetime.now()
+            self._pos_arr = pos_arr
+            self._pos_index = {ticker: i for i, ticker in enumerate(tickers)}
+            self._pos_tickers = tickers
+            self.last_check_time = tick_now
             
-            self.logger.info(f"Position check completed", 
+            self.logger.info("Position check completed", 
                            position_count=len(current_positions),
                            timestamp=self.last_check_time.isoformat())
             
         except Exception as e:
             self.logger.error("Error checking positions", error=str(e))
     
-    def _detect_position_changes(self, current_positions: Dict):
+    def _detect_position_changes(self, tickers: List[str], pos_arr: np.ndarray):
         """Detect changes in positions"""
         try:
-            for ticker, current_pos in current_positions.items():
-                if ticker in self.positions:
-                    old_pos = self.positions[ticker]
-                    
-                    # Check for significant changes
-                    price_change = abs(current_pos['current_price'] - old_pos['current_price']) / old_pos['current_price']
-                    shares_change = abs(current_pos['shares'] - old_pos['shares'])
-                    
-                    if price_change > 0.05:  # 5% price change
-                        self.logger.info(f"Significant price change for {ticker}", 
-                                       old_price=old_pos['current_price'],
-                                       new_price=current_pos['current_price'],
-                                       change_pct=price_change*100)
-                    
-                    if shares_change > 0:
-                        self.logger.info(f"Position size change for {ticker}", 
-                                       old_shares=old_pos['shares'],
-                                       new_shares=current_pos['shares'],
-                                       change=shares_change)
-                else:
-                    # New position
-                    self.logger.info(f"New position detected for {ticker}", 
-                                   shares=current_pos['shares'],
-                                   entry_price=current_pos['entry_price'])
+            # Align current rows with the previous cycle's rows (-1 = new position)
+            prev_rows = np.fromiter((self._pos_index.get(ticker, -1) for ticker in tickers),
+                                    dtype=np.intp, count=len(tickers))
+            existing = prev_rows >= 0
+            existing_rows = np.flatnonzero(existing)
+            old_pos = self._pos_arr[prev_rows[existing]]
+            current_pos = pos_arr[existing]
+            
+            # Check for significant changes
+            old_price = old_pos['current_price']
+            new_price = current_pos['current_price']
+            # Zero prices yield 0% change instead of aborting the whole check
+            price_change = np.divide(np.abs(new_price - old_price), old_price,
+                                     out=np.zeros_like(old_price), where=old_price > 0)
+            shares_change = np.abs(current_pos['shares'] - old_pos['shares'])
+            
+            for j in np.flatnonzero(price_change > 0.05):  # 5% price change
+                ticker = tickers[existing_rows[j]]
+                self.logger.info("Significant price change", ticker=ticker, 
+                               old_price=float(old_price[j]),
+                               new_price=float(new_price[j]),
+                               change_pct=float(price_change[j])*100)
+            
+            for j in np.flatnonzero(shares_change > 0):
+                ticker = tickers[existing_rows[j]]
+                self.logger.info("Position size change", ticker=ticker, 
+                               old_shares=int(old_pos['shares'][j]),
+                               new_shares=int(current_pos['shares'][j]),
+                               change=int(shares_change[j]))
+            
+            # New positions
+            for i in np.flatnonzero(~existing):
+                ticker = tickers[i]
+                self.logger.info("New position detected", ticker=ticker, 
+                               shares=int(pos_arr['shares'][i]),
+                               entry_price=float(pos_arr['entry_price'][i]))
             
             # Check for closed positions
-            for ticker in self.positions:
-                if ticker not in current_positions:
-                    self.logger.info(f"Position closed for {ticker}")
+            current_tickers = set(tickers)
+            for ticker in self._pos_tickers:
+                if ticker not in current_tickers:
+                    self.logger.info("Position closed", ticker=ticker)
                     
         except Exception as e:
             self.logger.error("Error detecting position changes", error=str(e))
     
-    async def _execute_management_actions(self):
+    async def _execute_management_actions(self, tick_now: Optional[datetime] = None):
         """Execute position management actions"""
         if not self.enable_automated_management:
             return
         
+        # Nothing to manage (common off-hours case) - skip the checks and the log line
+        if not self.positions:
+            return
+        
+        if tick_now is None:
+            tick_now = datetime.now()
+        
         try:
             self.logger.info("Executing position management actions")
             
             # Check for averaging down opportunities
-            await self._check_averaging_down_opportunities()
+            await self._check_averaging_down_opportunities(tick_now)
             
             # Check for profit taking opportunities
-            await self._check_profit_taking_opportunities()
+            await self._check_profit_taking_opportunities(tick_now)
             
             # Check for rebalancing needs
-            await self._check_rebalancing_needs()
+            await self._check_rebalancing_needs(tick_now)
             
             # Check for stop loss triggers
-            await self._check_stop_loss_triggers()
+            await self._check_stop_loss_triggers(tick_now)
             
         except Exception as e:
             self.logger.error("Error executing management actions", error=str(e))
     
-    async def _check_averaging_down_opportunities(self):
+    async def _check_averaging_down_opportunities(self, tick_now: datetime):
         """Check for averaging down opportunities"""
         try:
             for ticker, position in self.positions.items():
-                # Get current ATR for this ticker
-                atr_data = self.master_agent.analysis_agent.data_manager.calculate_indicators_for_ticker(ticker)
-                if not atr_data or 'atr' not in atr_data:
+                # A bad ticker only skips itself, not the rest of the cycle
+                try:
+                    # Get current ATR for this ticker
+                    atr_data = self.master_agent.analysis_agent.data_manager.calculate_indicators_for_ticker(ticker)
+                    if not atr_data or 'atr' not in atr_data:
+                        continue
+                    
+                    atr_value = atr_data['atr']
+                    current_price = position['current_price']
+                    entry_price = position['entry_price']
+                    
+                    # Check if we should average down
+                    should_average, confidence, reasoning = self.master_agent.position_manager.should_average_down(
+                        ticker, current_price, entry_price, atr_value, 0.02
+                    )
+                except Exception as e:
+                    self.logger.error("Error evaluating averaging down", ticker=ticker, error=str(e))
                     continue
                 
-                atr_value = atr_data['atr']
-                current_price = position['current_price']
-                entry_price = position['entry_price']
-                
-                # Check if we should average down
-                should_average, confidence, reasoning = self.master_agent.position_manager.should_average_down(
-                    ticker, current_price, entry_price, atr_value, 0.02
-                )
-                
                 if should_average:
-                    self.logger.info(f"Averaging down opportunity for {ticker}", 
+                    self.logger.info("Averaging down opportunity", ticker=ticker, 
                                    current_price=current_price,
                                    entry_price=entry_price,
                                    atr_value=atr_value,
                                    confidence=confidence,
                                    reasoning=reasoning)
                     
-                    # Execute averaging down (if enabled)
-                    if self.enable_automated_management:
-                        await self._execute_averaging_down(ticker, position, atr_value)
+                    # Execute averaging down
+                    await self._execute_averaging_down(ticker, position, atr_value, tick_now)
                         
         except Exception as e:
             self.logger.error("Error checking averaging down opportunities", error=str(e))
     
-    async def _check_profit_taking_opportunities(self):
+    async def _check_profit_taking_opportunities(self, tick_now: datetime):
         """Check for profit taking opportunities"""
         try:
-            for ticker, position in self.positions.items():
-                # Get current technical indicators
-                indicators = self.master_agent.analysis_agent.data_manager.calculate_indicators_for_ticker(ticker)
-                if not indicators:
+            pos_arr = self._pos_arr
+            if not len(pos_arr):
+                return
+            
+            # Gather 200 SMA per position; rows without indicators are skipped entirely
+            sma_200 = np.zeros(len(pos_arr))
+            has_indicators = np.zeros(len(pos_arr), dtype=bool)
+            for i, ticker in enumerate(self._pos_tickers):
+                try:
+                    indicators = self.master_agent.analysis_agent.data_manager.calculate_indicators_for_ticker(ticker)
+                    if not indicators:
+                        continue
+                    
+                    # Indicators are Series; compare against the latest bar's 200 SMA
+                    sma_series = indicators.get('sma_200')
+                    sma_200[i] = float(sma_series.iloc[-1]) if sma_series is not None and len(sma_series) else 0.0
+                    has_indicators[i] = True
+                except Exception as e:
+                    self.logger.error("Error fetching indicators", ticker=ticker, error=str(e))
                     continue
+            
+            current_price = pos_arr['current_price']
+            entry_price = pos_arr['entry_price']
+            
+            # Check if price is significantly above 200 SMA
+            sma_valid = has_indicators & (sma_200 > 0)
+            extended_from_sma = np.divide(current_price - sma_200, sma_200,
+                                          out=np.zeros_like(sma_200), where=sma_valid)
+            extended_mask = sma_valid & (extended_from_sma >= self._extended_thresh)
+            
+            # Check for general profit taking threshold
+            profit_pct = np.divide(current_price - entry_price, entry_price,
+                                   out=np.zeros_like(entry_price), where=entry_price > 0)
+            profit_mask = has_indicators & (profit_pct >= self._profit_thresh)
+            
+            # Only the (rare) triggered rows take the Python slow path
+            for i in np.flatnonzero(extended_mask | profit_mask):
+                ticker = self._pos_tickers[i]
+                position = self.positions[ticker]
                 
-                current_price = position['current_price']
-                entry_price = position['entry_price']
-                sma_200 = indicators.get('sma_200', 0)
-                
-                if sma_200 > 0:
-                    # Check if price is significantly above 200 SMA
-                    extended_from_sma = (current_price - sma_200) / sma_200
-                    extended_threshold = self.config.get('trading', {}).get('sell_conditions', {}).get('extended_from_200sma_pct', 15) / 100
+                if extended_mask[i]:
+                    self.logger.info("Profit taking opportunity", ticker=ticker, 
+                                   current_price=position['current_price'],
+                                   sma_200=float(sma_200[i]),
+                                   extended_pct=float(extended_from_sma[i])*100)
                     
-                    if extended_from_sma >= extended_threshold:
-                        self.logger.info(f"Profit taking opportunity for {ticker}", 
-                                       current_price=current_price,
-                                       sma_200=sma_200,
-                                       extended_pct=extended_from_sma*100)
-                        
-                        # Execute partial profit taking
-                        if self.enable_automated_management:
-                            await self._execute_partial_profit_taking(ticker, position)
-                
-                # Check for general profit taking threshold
-                profit_pct = (current_price - entry_price) / entry_price
-                profit_threshold = self.config.get('trading', {}).get('sell_conditions', {}).get('profit_taking_pct', 50) / 100
+                    # Execute partial profit taking
+                    await self._execute_partial_profit_taking(ticker, position, tick_now)
                 
-                if profit_pct >= profit_threshold:
-                    self.logger.info(f"General profit taking opportunity for {ticker}", 
-                                   profit_pct=profit_pct*100,
-                                   threshold=profit_threshold*100)
+                if profit_mask[i]:
+                    self.logger.info("General profit taking opportunity", ticker=ticker, 
+                                   profit_pct=float(profit_pct[i])*100,
+                                   threshold=self._profit_thresh*100)
                     
                     # Execute profit taking
-                    if self.enable_automated_management:
-                        await self._execute_profit_taking(ticker, position)
+                    await self._execute_profit_taking(ticker, position, tick_now)
                         
         except Exception as e:
             self.logger.error("Error checking profit taking opportunities", error=str(e))
     
-    async def _check_rebalancing_needs(self):
+    async def _check_rebalancing_needs(self, tick_now: datetime):
         """Check if portfolio needs rebalancing"""
         try:
             if not self.positions:
@@ -274,42 +364,47 @@ class PositionMonitor:
             allocation_diff = abs(current_allocation - target_allocation)
             
             if allocation_diff > self.rebalance_threshold:
-                self.logger.info(f"Rebalancing needed", 
+                self.logger.info("Rebalancing needed", 
                                current_allocation=current_allocation*100,
                                target_allocation=target_allocation*100,
                                difference=allocation_diff*100)
                 
                 # Execute rebalancing
-                if self.enable_automated_management:
-                    await self._execute_rebalancing(portfolio_value, target_allocation)
+                await self._execute_rebalancing(portfolio_value, target_allocation, tick_now)
                     
         except Exception as e:
             self.logger.error("Error checking rebalancing needs", error=str(e))
     
-    async def _check_stop_loss_triggers(self):
+    async def _check_stop_loss_triggers(self, tick_now: datetime):
         """Check for stop loss triggers"""
         try:
-            for ticker, position in self.positions.items():
-                current_price = position['current_price']
-                entry_price = position['entry_price']
-                
-                # Calculate loss percentage
-                loss_pct = (entry_price - current_price) / entry_price
-                stop_loss_threshold = self.config.get('trading', {}).get('sell_conditions', {}).get('stop_loss_pct', 25) / 100
+            pos_arr = self._pos_arr
+            if not len(pos_arr):
+                return
+            
+            # Calculate loss percentage for every position at once
+            entry_price = pos_arr['entry_price']
+            loss_pct = np.divide(entry_price - pos_arr['current_price'], entry_price,
+                                 out=np.zeros_like(entry_price), where=entry_price > 0)
+            stop_mask = loss_pct >= self._stop_loss_thresh
+            
+            for i in np.flatnonzero(stop_mask):
+                ticker = self._pos_tickers[i]
+                self.logger.warning("Stop loss triggered", ticker=ticker, 
+                                  loss_pct=float(loss_pct[i])*100,
+                                  threshold=self._stop_loss_thresh*100)
                 
-                if loss_pct >= stop_loss_threshold:
-                    self.logger.warning(f"Stop loss triggered for {ticker}", 
-                                      loss_pct=loss_pct*100,
-                                      threshold=stop_loss_threshold*100)
-                    
-                    # Execute stop loss
-                    if self.enable_automated_management:
-                        await self._execute_stop_loss(ticker, position)
+                # Execute stop loss
+                await self._execute_stop_loss(ticker, self.positions[ticker], tick_now)
                         
         except Exception as e:
             self.logger.error("Error checking stop loss triggers", error=str(e))
     
-    async def _execute_averaging_down(self, ticker: str, position: Dict, atr_value: float):
+    async def _submit_order(self, **order_params):
+        """Submit an order off the event loop; the checks await each order in turn, so at most one is in flight"""
+        return await asyncio.to_thread(self.master_agent.alpaca_client.submit_order, **order_params)
+    
+    async def _execute_averaging_down(self, ticker: str, position: Dict, atr_value: float, tick_now: datetime):
         """Execute averaging down for a position"""
         try:
             # Calculate new position size
@@ -325,7 +420,7 @@ class PositionMonitor:
                 shares_to_buy = new_position_size['shares']
                 
                 # Execute buy order
-                order = self.master_agent.alpaca_client.submit_order(
+                order = await self._submit_order(
                     symbol=ticker,
                     qty=shares_to_buy,
                     side='buy',
@@ -333,24 +428,24 @@ class PositionMonitor:
                     time_in_force='day'
                 )
                 
-                self.logger.info(f"Averaging down executed for {ticker}", 
+                self.logger.info("Averaging down executed", ticker=ticker, 
                                shares=shares_to_buy,
                                price=current_price,
                                order_id=order.id)
                 
                 # Record management action
-                self._record_management_action(ticker, 'AVERAGE_DOWN', shares_to_buy, current_price)
+                self._record_management_action(ticker, 'AVERAGE_DOWN', shares_to_buy, current_price, tick_now)
                 
         except Exception as e:
-            self.logger.error(f"Error executing averaging down for {ticker}", error=str(e))
+            self.logger.error("Error executing averaging down", ticker=ticker, error=str(e))
     
-    async def _execute_partial_profit_taking(self, ticker: str, position: Dict):
+    async def _execute_partial_profit_taking(self, ticker: str, position: Dict, tick_now: datetime):
         """Execute partial profit taking"""
         try:
             shares_to_sell = position['shares'] // 2  # Sell half
             
             # Execute sell order
-            order = self.master_agent.alpaca_client.submit_order(
+            order = await self._submit_order(
                 symbol=ticker,
                 qty=shares_to_sell,
                 side='sell',
@@ -358,24 +453,24 @@ class PositionMonitor:
                 time_in_force='day'
             )
             
-            self.logger.info(f"Partial profit taking executed for {ticker}", 
+            self.logger.info("Partial profit taking executed", ticker=ticker, 
                            shares=shares_to_sell,
                            price=position['current_price'],
                            order_id=order.id)
             
             # Record management action
-            self._record_management_action(ticker, 'PARTIAL_PROFIT_TAKING', shares_to_sell, position['current_price'])
+            self._record_management_action(ticker, 'PARTIAL_PROFIT_TAKING', shares_to_sell, position['current_price'], tick_now)
             
         except Exception as e:
-            self.logger.error(f"Error executing partial profit taking for {ticker}", error=str(e))
+            self.logger.error("Error executing partial profit taking", ticker=ticker, error=str(e))
     
-    async def _execute_profit_taking(self, ticker: str, position: Dict):
+    async def _execute_profit_taking(self, ticker: str, position: Dict, tick_now: datetime):
         """Execute full profit taking"""
         try:
             shares_to_sell = position['shares']
             
             # Execute sell order
-            order = self.master_agent.alpaca_client.submit_order(
+            order = await self._submit_order(
                 symbol=ticker,
                 qty=shares_to_sell,
                 side='sell',
@@ -383,24 +478,24 @@ class PositionMonitor:
                 time_in_force='day'
             )
             
-            self.logger.info(f"Profit taking executed for {ticker}", 
+            self.logger.info("Profit taking executed", ticker=ticker, 
                            shares=shares_to_sell,
                            price=position['current_price'],
                            order_id=order.id)
             
             # Record management action
-            self._record_management_action(ticker, 'PROFIT_TAKING', shares_to_sell, position['current_price'])
+            self._record_management_action(ticker, 'PROFIT_TAKING', shares_to_sell, position['current_price'], tick_now)
             
         except Exception as e:
-            self.logger.error(f"Error executing profit taking for {ticker}", error=str(e))
+            self.logger.error("Error executing profit taking", ticker=ticker, error=str(e))
     
-    async def _execute_stop_loss(self, ticker: str, position: Dict):
+    async def _execute_stop_loss(self, ticker: str, position: Dict, tick_now: datetime):
         """Execute stop loss"""
         try:
             shares_to_sell = position['shares']
             
             # Execute sell order
-            order = self.master_agent.alpaca_client.submit_order(
+            order = await self._submit_order(
                 symbol=ticker,
                 qty=shares_to_sell,
                 side='sell',
@@ -408,18 +503,18 @@ class PositionMonitor:
                 time_in_force='day'
             )
             
-            self.logger.warning(f"Stop loss executed for {ticker}", 
+            self.logger.warning("Stop loss executed", ticker=ticker, 
                               shares=shares_to_sell,
                               price=position['current_price'],
                               order_id=order.id)
             
             # Record management action
-            self._record_management_action(ticker, 'STOP_LOSS', shares_to_sell, position['current_price'])
+            self._record_management_action(ticker, 'STOP_LOSS', shares_to_sell, position['current_price'], tick_now)
             
         except Exception as e:
-            self.logger.error(f"Error executing stop loss for {ticker}", error=str(e))
+            self.logger.error("Error executing stop loss", ticker=ticker, error=str(e))
     
-    async def _execute_rebalancing(self, portfolio_value: float, target_allocation: float):
+    async def _execute_rebalancing(self, portfolio_value: float, target_allocation: float, tick_now: datetime):
         """Execute portfolio rebalancing"""
         try:
             # This is a simplified rebalancing - in production you'd want more sophisticated logic
@@ -428,16 +523,18 @@ class PositionMonitor:
                            target_allocation=target_allocation)
             
             # Record management action
-            self._record_management_action('PORTFOLIO', 'REBALANCING', 0, 0)
+            self._record_management_action('PORTFOLIO', 'REBALANCING', 0, 0, tick_now)
             
         except Exception as e:
             self.logger.error("Error executing rebalancing", error=str(e))
     
-    def _record_management_action(self, ticker: str, action: str, shares: int, price: float):
+    def _record_management_action(self, ticker: str, action: str, shares: int, price: float,
+                                  timestamp: Optional[datetime] = None):
         """Record a management action in history"""
         try:
+            timestamp = timestamp or datetime.now()
             action_record = {
-                'timestamp': datetime.now(),
+                'timestamp': timestamp,
                 'ticker': ticker,
                 'action': action,
                 'shares': shares,
@@ -447,6 +544,13 @@ class PositionMonitor:
             
             self.management_history.append(action_record)
             
+            # Running per-day counter so status polls don't rescan history
+            action_date = timestamp.date()
+            if action_date != self._today_date:
+                self._today_date = action_date
+                self._today_actions = 0
+            self._today_actions += 1
+            
             # Keep only last 100 actions
             if len(self.management_history) > 100:
                 self.management_history = self.management_history[-100:]
@@ -456,14 +560,14 @@ class PositionMonitor:
     
     def get_monitoring_status(self) -> Dict:
         """Get current monitoring status"""
+        actions_today = self._today_actions if self._today_date == date.today() else 0
         return {
             'running': self.running,
             'check_interval_minutes': self.check_interval,
             'automated_management': self.enable_automated_management,
             'last_check_time': self.last_check_time.isoformat() if self.last_check_time else None,
             'position_count': len(self.positions),
-            'management_actions_today': len([a for a in self.management_history 
-                                          if a['timestamp'].date() == datetime.now().date()])
+            'management_actions_today': actions_today
         }
     
     def get_position_summary(self) -> Dict:
@@ -1,17 +1,216 @@
 """
 Technical indicators utility for the AI Trading Bot
 """
+import functools
+from collections.abc import Mapping
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime, timedelta
 
+# Numba is optional; without it the kernels below run as plain Python
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+    
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit"""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+# fastmath without the no-NaN/no-Inf assumptions, so NaN inputs still propagate
+_FASTMATH = {'nsz', 'arcp', 'contract', 'afn', 'reassoc'}
+
+# Indicator series are stored in single precision; running sums are still accumulated in float64
+_INDICATOR_DTYPE = np.float32
+
+# Explicit signatures compile the kernels when the module is imported (and cache=True keeps the
+# machine code on disk), so the first scheduled evaluation does not pay the JIT latency
+@njit('float32[:](float32[:], float32[:], float32[:], int64)', cache=True, fastmath=_FASTMATH)
+def _atr_wilder(high, low, close, period):
+    """True range and Wilder's smoothing in a single pass"""
+    n = len(close)
+    atr = np.empty(n, dtype=np.float32)
+    if n == 0:
+        return atr
+    
+    value = float(high[0] - low[0])
+    atr[0] = value
+    for i in range(1, n):
+        prev_close = close[i - 1]
+        tr = max(high[i] - low[i], abs(high[i] - prev_close), abs(low[i] - prev_close))
+        value += (tr - value) / period
+        atr[i] = value
+    return atr
+
+@njit('float32[:](float32[:], int64)', cache=True, error_model='numpy')
+def _nymo_kernel(close, lookback):
+    """Z-scored rate of change over a rolling window, scaled by 50 (0 where undefined)"""
+    n = len(close)
+    nymo = np.zeros(n, dtype=np.float32)
+    pct = np.full(n, np.nan)
+    for i in range(lookback, n):
+        pct[i] = float(close[i]) / float(close[i - lookback]) - 1.0
+    
+    # Running sum / sum of squares over the last `lookback` rate-of-change values; non-finite values
+    # (from a missing close) stay out of the sums and are counted instead, so they leave the window
+    # cleanly and only the windows that contain one come out as 0, as with pandas rolling
+    window_sum = 0.0
+    window_sumsq = 0.0
+    missing = 0
+    for i in range(lookback, n):
+        if np.isfinite(pct[i]):
+            window_sum += pct[i]
+            window_sumsq += pct[i] * pct[i]
+        else:
+            missing += 1
+        if i >= 2 * lookback:
+            old = pct[i - lookback]
+            if np.isfinite(old):
+                window_sum -= old
+                window_sumsq -= old * old
+            else:
+                missing -= 1
+        if i >= 2 * lookback - 1 and missing == 0:
+            mean = window_sum / lookback
+            var = max((window_sumsq - window_sum * mean) / (lookback - 1), 0.0)
+            value = (pct[i] - mean) / np.sqrt(var) * 50.0
+            if not np.isnan(value):
+                nymo[i] = value
+    return nymo
+
+@njit('float32[:](float32[:], int64)', cache=True)
+def _rolling_max(values, window):
+    """Rolling maximum via a monotonic deque of indices, O(n) amortized"""
+    n = len(values)
+    out = np.full(n, np.nan, dtype=np.float32)
+    dq = np.empty(n, dtype=np.int64)
+    head = 0
+    tail = 0
+    for i in range(n):
+        # Drop indices whose values can never be the maximum again
+        while head < tail and values[dq[tail - 1]] <= values[i]:
+            tail -= 1
+        dq[tail] = i
+        tail += 1
+        if dq[head] <= i - window:
+            head += 1
+        if i >= window - 1:
+            out[i] = values[dq[head]]
+    return out
+
+@njit('boolean[:, :](float64[:, :], float64[:, :, :])', cache=True, parallel=True)
+def _batch_cross_below(close_tail, line_tail):
+    """Cross-below flags for every (ticker, line) pair from the last two bars of each"""
+    n_tickers, n_lines = line_tail.shape[0], line_tail.shape[1]
+    crosses = np.zeros((n_tickers, n_lines), dtype=np.bool_)
+    for t in prange(n_tickers):
+        prev_price = close_tail[t, 0]
+        current_price = close_tail[t, 1]
+        for j in range(n_lines):
+            crosses[t, j] = prev_price > line_tail[t, j, 0] and current_price < line_tail[t, j, 1]
+    return crosses
+
+def _ema_tail(close: np.ndarray, period: int, k: int = 2) -> np.ndarray:
+    """Last k values of ewm(span=period).mean() as weighted dot products over the recent tail"""
+    alpha = 2.0 / (period + 1)
+    decay = 1.0 - alpha
+    # Older bars carry less than 1e-12 of the weight, so only this many matter
+    horizon = int(np.ceil(np.log(1e-12) / np.log(decay))) if decay > 0 else 1
+    
+    k = min(k, len(close))
+    tail = np.empty(k)
+    for j in range(k):
+        end = len(close) - (k - 1 - j)
+        window = close[max(0, end - horizon):end]
+        weights = decay ** np.arange(len(window) - 1, -1, -1)
+        tail[j] = np.dot(weights, window) / weights.sum()
+    return tail
+
+def _batch_sma(close: np.ndarray, periods) -> Dict[int, np.ndarray]:
+    """Rolling means for several window lengths from a single cumulative sum"""
+    cs = np.concatenate(([0.0], np.cumsum(close, dtype=np.float64)))
+    means = {}
+    for period in periods:
+        out = np.full(len(close), np.nan, dtype=_INDICATOR_DTYPE)
+        if len(close) >= period:
+            out[period - 1:] = (cs[period:] - cs[:-period]) / period
+        means[period] = out
+    return means
+
+def _zeros_like(data: pd.DataFrame) -> pd.Series:
+    """All-zero indicator series aligned to the data, for short-data and error paths"""
+    return pd.Series(np.zeros(len(data), dtype=_INDICATOR_DTYPE), index=data.index, copy=False)
+
+# Bit in `above_bits` for "close above the previous N days average"
+_ABOVE_BITS = {10: 0b001, 15: 0b010, 20: 0b100}
+
+# Rule families and their variants, matched against rule names in this order
+_RULE_FAMILIES = (
+    ('sma_cross', ('21', '50', '200')),
+    ('ema_cross', ('10', '20', '40')),
+    ('atr', ()),
+    ('nymo', ()),
+)
+
+@functools.lru_cache(maxsize=None)
+def _parse_rule_name(rule_name: str) -> Tuple[Optional[str], Optional[str]]:
+    """Map a rule name to its (family, variant) handler key"""
+    for family, variants in _RULE_FAMILIES:
+        if family in rule_name:
+            for variant in variants:
+                if variant in rule_name:
+                    return family, variant
+            return family, None
+    return None, None
+
+class ATRMultiples(Mapping):
+    """ATR and its 2x-5x multiples, each multiple computed only when it is read"""
+    __slots__ = ('atr',)
+    
+    _MULTIPLIERS = {'atr': 1, 'atr_2x': 2, 'atr_3x': 3, 'atr_4x': 4, 'atr_5x': 5}
+    
+    def __init__(self, atr: pd.Series):
+        self.atr = atr
+    
+    def __getitem__(self, key: str) -> pd.Series:
+        multiplier = self._MULTIPLIERS[key]
+        return self.atr if multiplier == 1 else self.atr * multiplier
+    
+    def __iter__(self):
+        return iter(self._MULTIPLIERS)
+    
+    def __len__(self) -> int:
+        return len(self._MULTIPLIERS)
+
 class TechnicalIndicators:
     """Technical analysis indicators calculator"""
     
     def __init__(self):
         self.logger = None  # Will be set by the calling agent
         
+        # Last-two-bar indicator snapshots, keyed by (ticker, period) -> (indicators, snapshot)
+        self._snapshot_cache = {}
+        
+        # Close cumulative sums for previous-days averages, keyed by (ticker, period) -> (indicators, cumsum)
+        self._close_cumsum_cache = {}
+        
+        # Rule handlers keyed by the (family, variant) parsed from the rule name
+        self._rule_handlers = {
+            ('sma_cross', '21'): self._sma_21_cross_rule,
+            ('sma_cross', '50'): self._sma_50_cross_rule,
+            ('sma_cross', '200'): self._sma_200_cross_rule,
+            ('ema_cross', '10'): self._ema_10_cross_rule,
+            ('ema_cross', '20'): self._ema_20_cross_rule,
+            ('ema_cross', '40'): self._ema_40_cross_rule,
+            ('atr', None): self._atr_trailing_stop_rule,
+            ('nymo', None): self._nymo_rule,
+        }
+        
     def set_logger(self, logger):
         """Set logger instance"""
         self.logger = logger
@@ -22,32 +221,39 @@ class TechnicalIndicators:
     
     def calculate_ema(self, data: pd.DataFrame, period: int) -> pd.Series:
         """Calculate Exponential Moving Average"""
-        return data['close'].ewm(span=period).mean()
+        return data['close'].ewm(span=period).mean().astype(_INDICATOR_DTYPE)
     
     def calculate_atr(self, data: pd.DataFrame, period: int = 14, factor: float = 2.0) -> pd.Series:
         """Calculate Average True Range (ATR) using Wilder's smoothing"""
         try:
             if len(data) < period:
-                return pd.Series([0] * len(data), index=data.index)
+                return _zeros_like(data)
+            
+            high = data['high'].to_numpy(dtype=_INDICATOR_DTYPE)
+            low = data['low'].to_numpy(dtype=_INDICATOR_DTYPE)
+            close = data['close'].to_numpy(dtype=_INDICATOR_DTYPE)
             
-            # Calculate True Range
-            high_low = data['high'] - data['low']
-            high_close = abs(data['high'] - data['close'].shift())
-            low_close = abs(data['low'] - data['close'].shift())
+            if NUMBA_AVAILABLE:
+                return pd.Series(_atr_wilder(high, low, close, period), index=data.index)
             
-            true_range = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
+            # Calculate True Range (fmax skips the undefined previous close on the first bar)
+            prev_close = np.empty_like(close)
+            prev_close[0] = np.nan
+            prev_close[1:] = close[:-1]
+            true_range = np.fmax.reduce([high - low, np.abs(high - prev_close), np.abs(low - prev_close)])
             
             # Apply Wilder's smoothing (exponential moving average with alpha = 1/period)
-            atr = true_range.ewm(alpha=1/period, adjust=False).mean()
+            atr = pd.Series(true_range, index=data.index).ewm(alpha=1/period, adjust=False).mean()
+            atr = atr.astype(_INDICATOR_DTYPE)
             
             return atr
             
         except Exception as e:
             if self.logger:
                 self.logger.error(f"Error calculating ATR", error=str(e))
-            return pd.Series([0] * len(data), index=data.index)
+            return _zeros_like(data)
     
-    def calculate_atr_multiples(self, data: pd.DataFrame, period: int = 14) -> Dict[str, pd.Series]:
+    def calculate_atr_multiples(self, data: pd.DataFrame, period: int = 14) -> Mapping[str, pd.Series]:
         """
         Calculate ATR multiples for position sizing and averaging down
         
@@ -56,18 +262,10 @@ class TechnicalIndicators:
             period: ATR period
             
         Returns:
-            Dict with ATR and its multiples
+            Mapping with ATR and its multiples (multiples are computed on access)
         """
         try:
-            atr = self.calculate_atr(data, period)
-            
-            return {
-                'atr': atr,
-                'atr_2x': atr * 2,
-                'atr_3x': atr * 3,
-                'atr_4x': atr * 4,
-                'atr_5x': atr * 5
-            }
+            return ATRMultiples(self.calculate_atr(data, period))
             
         except Exception as e:
             if self.logger:
@@ -122,7 +320,11 @@ class TechnicalIndicators:
                                    factor: float = 2.5) -> pd.Series:
         """Calculate ATR Trailing Stop"""
         atr = self.calculate_atr(data, period, factor)
-        highest_high = data['high'].rolling(window=period).max()
+        if NUMBA_AVAILABLE:
+            highest_high = pd.Series(_rolling_max(data['high'].to_numpy(dtype=_INDICATOR_DTYPE), period),
+                                     index=data.index)
+        else:
+            highest_high = data['high'].astype(_INDICATOR_DTYPE).rolling(window=period).max()
         return highest_high - atr
     
     def calculate_nymo(self, data: pd.DataFrame) -> pd.Series:
@@ -131,21 +333,47 @@ class TechnicalIndicators:
             # For now, return a simple oscillator based on price momentum
             # In a real implementation, this would use advancing/declining issues data
             if len(data) < 20:
-                return pd.Series([0] * len(data), index=data.index)
-            
-            # Calculate momentum oscillator based on price change
-            price_change = data['close'].pct_change(20)
-            momentum = (price_change - price_change.rolling(20).mean()) / price_change.rolling(20).std()
+                return _zeros_like(data)
+            
+            if NUMBA_AVAILABLE:
+                nymo = _nymo_kernel(data['close'].to_numpy(dtype=_INDICATOR_DTYPE), 20)
+                return pd.Series(nymo, index=data.index)
+            
+            # Calculate momentum oscillator based on the 20-bar price change
+            lookback = 20
+            close = data['close'].to_numpy(dtype=np.float64)
+            price_change = np.full(len(close), np.nan)
+            price_change[lookback:] = close[lookback:] / close[:-lookback] - 1.0
+            
+            # Rolling mean / sample std of the defined changes from cumulative sums; a missing change
+            # is summed as 0 and counted, and any window holding one stays NaN (0 in the output)
+            changes = price_change[lookback:]
+            rolling_mean = np.full(len(close), np.nan)
+            rolling_std = np.full(len(close), np.nan)
+            if len(changes) >= lookback:
+                finite = np.isfinite(changes)
+                clean = np.where(finite, changes, 0.0)
+                cs = np.concatenate(([0.0], np.cumsum(clean)))
+                cs_sq = np.concatenate(([0.0], np.cumsum(clean * clean)))
+                cs_missing = np.concatenate(([0], np.cumsum(~finite)))
+                window_sum = cs[lookback:] - cs[:-lookback]
+                window_sumsq = cs_sq[lookback:] - cs_sq[:-lookback]
+                complete = (cs_missing[lookback:] - cs_missing[:-lookback]) == 0
+                mean = window_sum / lookback
+                std = np.sqrt(np.maximum((window_sumsq - window_sum * mean) / (lookback - 1), 0.0))
+                rolling_mean[2 * lookback - 1:] = np.where(complete, mean, np.nan)
+                rolling_std[2 * lookback - 1:] = np.where(complete, std, np.nan)
             
             # Scale to NYMO-like range (-100 to +100)
-            nymo = momentum * 50
+            with np.errstate(divide='ignore', invalid='ignore'):
+                nymo = (price_change - rolling_mean) / rolling_std * 50
             
-            return nymo.fillna(0)
+            return pd.Series(np.where(np.isnan(nymo), 0.0, nymo).astype(_INDICATOR_DTYPE), index=data.index)
             
         except Exception as e:
             if self.logger:
                 self.logger.error(f"Error calculating NYMO", error=str(e))
-            return pd.Series([0] * len(data), index=data.index)
+            return _zeros_like(data)
     
     def calculate_all_indicators(self, data: pd.DataFrame, ticker: str, period: str = 'D') -> Dict:
         """Calculate all technical indicators for a ticker"""
@@ -155,10 +383,13 @@ class TechnicalIndicators:
             
             indicators = {'data': data}
             
+            # Rolling means for the SMAs and the previous-days averages share one cumsum
+            close = data['close'].to_numpy(dtype=_INDICATOR_DTYPE)
+            rolling_means = _batch_sma(close, (21, 50, 200, 20, 15, 10))
+            
             # Calculate SMAs
-            indicators['sma_21'] = self.calculate_sma(data, 21)
-            indicators['sma_50'] = self.calculate_sma(data, 50)
-            indicators['sma_200'] = self.calculate_sma(data, 200)
+            for sma_period in (21, 50, 200):
+                indicators[f'sma_{sma_period}'] = pd.Series(rolling_means[sma_period], index=data.index)
             
             # Calculate EMAs
             indicators['ema_10'] = self.calculate_ema(data, 10)
@@ -175,14 +406,18 @@ class TechnicalIndicators:
             
             # Calculate price position relative to moving averages
             if len(data) >= 20:
-                # Price above previous 20 days average
-                indicators['above_previous_20_days'] = data['close'] > data['close'].rolling(20).mean()
-                
-                # Price above previous 15 days average
-                indicators['above_previous_15_days'] = data['close'] > data['close'].rolling(15).mean()
-                
-                # Price above previous 10 days average
-                indicators['above_previous_10_days'] = data['close'] > data['close'].rolling(10).mean()
+                # Price above previous 10/15/20 days average, packed one bit per window
+                above_bits = np.zeros(len(data), dtype=np.uint8)
+                for days, bit in _ABOVE_BITS.items():
+                    above_bits |= (close > rolling_means[days]).astype(np.uint8) * np.uint8(bit)
+                indicators['above_bits'] = above_bits
+            
+            # NumPy views of the close and every indicator, so rule evaluation never touches pandas
+            arrays = {'close': data['close'].to_numpy()}
+            for name, values in indicators.items():
+                if name != 'data':
+                    arrays[name] = values.to_numpy() if isinstance(values, pd.Series) else values
+            indicators['arrays'] = arrays
             
             self.logger.info(f"Calculated {len(indicators)} indicators for {ticker} ({period})", 
                            ticker=ticker, period=period, indicators_count=len(indicators))
@@ -195,6 +430,240 @@ class TechnicalIndicators:
                                 error=str(e), ticker=ticker)
             return {}
     
+    def _snapshot_indicators(self, indicators: Dict) -> Dict:
+        """Extract the last two values of the close and every indicator array into a flat dict"""
+        snapshot = {}
+        for name, values in indicators['arrays'].items():
+            if len(values) > 0:
+                snapshot[f'{name}_now'] = values[-1]
+            if len(values) >= 2:
+                snapshot[f'{name}_prev'] = values[-2]
+        return snapshot
+    
+    def _precompute_crosses(self, arrays: Dict[str, np.ndarray]) -> Dict[str, bool]:
+        """Flag every moving average / trailing stop the price just crossed below"""
+        close = arrays['close']
+        if len(close) < 2:
+            return {}
+        
+        prev_price, current_price = close[-2], close[-1]
+        crosses = {}
+        for name, values in arrays.items():
+            if not (name.startswith(('sma_', 'ema_')) or name == 'atr_trailing_stop'):
+                continue
+            if len(values) >= 2:
+                # Price was above the line on the previous bar and is below it now
+                crosses[f'{name}_cross_below'] = bool(prev_price > values[-2] and current_price < values[-1])
+        return crosses
+    
+    def precompute_crosses_batch(self, indicator_sets: Dict[Tuple[str, str], Dict]) -> None:
+        """Build rule snapshots for many (ticker, period) indicator sets with one parallel cross pass"""
+        try:
+            entries = [(key, indicators) for key, indicators in indicator_sets.items()
+                       if indicators and len(indicators['arrays']['close']) >= 2]
+            if not entries:
+                return
+            
+            line_names = sorted({name for _, indicators in entries for name in indicators['arrays']
+                                 if name.startswith(('sma_', 'ema_')) or name == 'atr_trailing_stop'})
+            line_index = {name: j for j, name in enumerate(line_names)}
+            
+            # Tickers x bars / tickers x lines x bars layout over the last two bars
+            close_tail = np.empty((len(entries), 2))
+            line_tail = np.full((len(entries), len(line_names), 2), np.nan)
+            present = np.zeros((len(entries), len(line_names)), dtype=bool)
+            for t, (_, indicators) in enumerate(entries):
+                close_tail[t] = indicators['arrays']['close'][-2:]
+                for name, values in indicators['arrays'].items():
+                    j = line_index.get(name)
+                    if j is None:
+                        continue
+                    if len(values) >= 2:
+                        line_tail[t, j] = values[-2:]
+                        present[t, j] = True
+            
+            crosses = _batch_cross_below(close_tail, line_tail)
+            
+            for t, (key, indicators) in enumerate(entries):
+                snapshot = self._snapshot_indicators(indicators)
+                for j in np.flatnonzero(present[t]):
+                    snapshot[f'{line_names[j]}_cross_below'] = bool(crosses[t, j])
+                self._snapshot_cache[key] = (indicators, snapshot)
+            
+        except Exception as e:
+            if self.logger:
+                self.logger.error("Error precomputing batch crosses", error=str(e))
+    
+    def _get_snapshot(self, ticker: str, period: str, indicators: Dict) -> Dict:
+        """Get the cached indicator snapshot, rebuilding it when a new indicator set arrives"""
+        cached = self._snapshot_cache.get((ticker, period))
+        if cached is not None and cached[0] is indicators:
+            return cached[1]
+        
+        snapshot = self._snapshot_indicators(indicators)
+        snapshot.update(self._precompute_crosses(indicators['arrays']))
+        self._snapshot_cache[(ticker, period)] = (indicators, snapshot)
+        return snapshot
+    
+    def _mean_last_n(self, ticker: str, period: str, indicators: Dict, close_arr: np.ndarray, n: int) -> float:
+        """Mean of the last n closes in O(1) from a cumulative sum built once per indicator set"""
+        cached = self._close_cumsum_cache.get((ticker, period))
+        if cached is not None and cached[0] is indicators:
+            cs = cached[1]
+        else:
+            cs = np.concatenate(([0.0], np.cumsum(close_arr, dtype=np.float64)))
+            self._close_cumsum_cache[(ticker, period)] = (indicators, cs)
+        return (cs[-1] - cs[-1 - n]) / n
+    
+    def _ema_cross_below(self, snap: Dict, close_arr: np.ndarray, length: int, current_price: float) -> bool:
+        """Cross flag for an EMA length; lengths without a precomputed series only need their last two values"""
+        ema_cross_key = f'ema_{length}_cross_below'
+        # Unlike the original evaluator, which never fired for an EMA length it had no series for, a rule
+        # with such a length (e.g. the default 21) is now evaluated against its EMA tail
+        if ema_cross_key not in snap and len(close_arr) >= 2:
+            prev_ema, current_ema = _ema_tail(close_arr, length, 2)
+            snap[ema_cross_key] = bool(close_arr[-2] > prev_ema and current_price < current_ema)
+        return snap.get(ema_cross_key, False)
+    
+    def _sma_21_cross_rule(self, rule: Dict, snap: Dict, close_arr: np.ndarray, current_price: float,
+                           confidence: float, reasoning: List[str]) -> Tuple[bool, float]:
+        """21 SMA cross below: price was above the SMA on the previous bar, now below"""
+        length = rule.get('length', 21)
+        if not snap.get(f'sma_{length}_cross_below'):
+            return False, confidence
+        
+        confidence = 0.8
+        reasoning.append(f"Price crossed below {length}-period SMA")
+        
+        # Check if above 50 and 200 SMA (for priority 1-2 rules)
+        if rule.get('priority', 5) <= 2:
+            if current_price > snap.get('sma_50_now', 0) and current_price > snap.get('sma_200_now', 0):
+                reasoning.append("Price above 50 and 200 SMA")
+                confidence += 0.1
+            else:
+                confidence -= 0.2
+                reasoning.append("Price below 50 or 200 SMA")
+        return True, confidence
+    
+    def _sma_50_cross_rule(self, rule: Dict, snap: Dict, close_arr: np.ndarray, current_price: float,
+                           confidence: float, reasoning: List[str]) -> Tuple[bool, float]:
+        """50 SMA cross below"""
+        length = rule.get('length', 21)
+        if not snap.get(f'sma_{length}_cross_below'):
+            return False, confidence
+        
+        confidence = 0.7
+        reasoning.append(f"Price crossed below {length}-period SMA")
+        
+        # Check if above 200 SMA (for priority 2 rule)
+        if rule.get('priority', 5) == 2:
+            if current_price > snap.get('sma_200_now', 0):
+                reasoning.append("Price above 200 SMA")
+                confidence += 0.1
+            else:
+                confidence -= 0.2
+                reasoning.append("Price below 200 SMA")
+        return True, confidence
+    
+    def _sma_200_cross_rule(self, rule: Dict, snap: Dict, close_arr: np.ndarray, current_price: float,
+                            confidence: float, reasoning: List[str]) -> Tuple[bool, float]:
+        """200 SMA cross below"""
+        length = rule.get('length', 21)
+        if not snap.get(f'sma_{length}_cross_below'):
+            return False, confidence
+        
+        reasoning.append(f"Price crossed below {length}-period SMA")
+        return True, 0.6
+    
+    def _ema_10_cross_rule(self, rule: Dict, snap: Dict, close_arr: np.ndarray, current_price: float,
+                           confidence: float, reasoning: List[str]) -> Tuple[bool, float]:
+        """10 EMA cross below while above the 20/40 EMA and 200 SMA"""
+        length = rule.get('length', 21)
+        if not self._ema_cross_below(snap, close_arr, length, current_price):
+            return False, confidence
+        
+        confidence = 0.75
+        reasoning.append(f"Price crossed below {length}-period EMA")
+        
+        # Check if above 20, 40, and 200 SMA
+        if (current_price > snap.get('ema_20_now', 0) and 
+            current_price > snap.get('ema_40_now', 0) and 
+            current_price > snap.get('sma_200_now', 0)):
+            reasoning.append("Price above 20, 40, and 200 SMA")
+            confidence += 0.1
+        else:
+            confidence -= 0.2
+            reasoning.append("Price below 20, 40, or 200 SMA")
+        return True, confidence
+    
+    def _ema_20_cross_rule(self, rule: Dict, snap: Dict, close_arr: np.ndarray, current_price: float,
+                           confidence: float, reasoning: List[str]) -> Tuple[bool, float]:
+        """20 EMA cross below while above the 40 EMA and 200 SMA"""
+        length = rule.get('length', 21)
+        if not self._ema_cross_below(snap, close_arr, length, current_price):
+            return False, confidence
+        
+        confidence = 0.7
+        reasoning.append(f"Price crossed below {length}-period EMA")
+        
+        # Check if above 40 and 200 SMA
+        if (current_price > snap.get('ema_40_now', 0) and 
+            current_price > snap.get('sma_200_now', 0)):
+            reasoning.append("Price above 40 and 200 SMA")
+            confidence += 0.1
+        else:
+            confidence -= 0.2
+            reasoning.append("Price below 40 or 200 SMA")
+        return True, confidence
+    
+    def _ema_40_cross_rule(self, rule: Dict, snap: Dict, close_arr: np.ndarray, current_price: float,
+                           confidence: float, reasoning: List[str]) -> Tuple[bool, float]:
+        """40 EMA cross below while above the 200 SMA"""
+        length = rule.get('length', 21)
+        if not self._ema_cross_below(snap, close_arr, length, current_price):
+            return False, confidence
+        
+        confidence = 0.65
+        reasoning.append(f"Price crossed below {length}-period EMA")
+        
+        # Check if above 200 SMA
+        if current_price > snap.get('sma_200_now', 0):
+            reasoning.append("Price above 200 SMA")
+            confidence += 0.1
+        else:
+            confidence -= 0.2
+            reasoning.append("Price below 200 SMA")
+        return True, confidence
+    
+    def _atr_trailing_stop_rule(self, rule: Dict, snap: Dict, close_arr: np.ndarray, current_price: float,
+                                confidence: float, reasoning: List[str]) -> Tuple[bool, float]:
+        """ATR trailing stop - check if price crossed below the stop"""
+        if 'atr_trailing_stop_cross_below' not in snap:
+            return False, confidence
+        
+        if snap['atr_trailing_stop_cross_below']:
+            reasoning.append("Price crossed below ATR trailing stop")
+            return True, 0.7
+        
+        reasoning.append("Price did not cross below ATR trailing stop")
+        return False, confidence - 0.3
+    
+    def _nymo_rule(self, rule: Dict, snap: Dict, close_arr: np.ndarray, current_price: float,
+                   confidence: float, reasoning: List[str]) -> Tuple[bool, float]:
+        """NYMO threshold check"""
+        nymo_threshold = rule.get('nymo_threshold', -50)
+        if not snap.get('nymo_now', 0) < nymo_threshold:
+            return False, confidence
+        
+        reasoning.append(f"NYMO below {nymo_threshold}")
+        
+        # Higher confidence for more extreme NYMO values
+        if nymo_threshold == -100:
+            return True, 0.95
+        elif nymo_threshold == -70:
+            return True, 0.9
+        return True, 0.8
+    
     def evaluate_trading_rule(self, ticker: str, rule: Dict, indicators: Dict) -> Tuple[bool, float, str]:
         """Evaluate a trading rule based on the rule description from rules.json"""
         try:
@@ -210,16 +679,22 @@ class TechnicalIndicators:
             confidence = 0.0
             reasoning = []
             
-            # Get current price and data
-            current_price = indicators['data']['close'].iloc[-1]
-            data = indicators['data']
+            # Close array once per call
+            close_arr = indicators['arrays']['close']
+            snap = self._get_snapshot(ticker, period, indicators)
+            current_price = snap['close_now']
             
             # Check if price is above the previous days average (common requirement)
             if 'previous_days' in rule:
                 # Calculate average of last N days
-                if len(data) >= previous_days:
-                    previous_avg = data['close'].tail(previous_days).mean()
-                    if current_price > previous_avg:
+                if len(close_arr) >= previous_days:
+                    bit = _ABOVE_BITS.get(previous_days)
+                    if bit is not None and 'above_bits_now' in snap:
+                        above_average = (snap['above_bits_now'] & bit) != 0
+                    else:
+                        above_average = current_price > self._mean_last_n(ticker, period, indicators, close_arr,
+                                                                          previous_days)
+                    if above_average:
                         reasoning.append(f"Price above previous {previous_days} days average")
                         confidence += 0.2
                     else:
@@ -228,201 +703,9 @@ class TechnicalIndicators:
                         return False, confidence, "; ".join(reasoning)
             
             # Rule-specific logic based on description
-            if 'sma_cross' in rule_name:
-                if '21' in rule_name:
-                    # 21 SMA cross below logic
-                    sma_21 = indicators.get(f'sma_{length}', pd.Series([0]))
-                    if hasattr(sma_21, '__len__') and len(sma_21) >= 2:
-                        # Check if price crossed below 21 SMA
-                        prev_price = data['close'].iloc[-2]
-                        prev_sma = sma_21.iloc[-2] if hasattr(sma_21, 'iloc') else sma_21[-2]
-                        current_sma = sma_21.iloc[-1] if hasattr(sma_21, 'iloc') else sma_21[-1]
-                        
-                        # Price was above SMA yesterday, now below (crossing down)
-                        if prev_price > prev_sma and current_price < current_sma:
-                            signal_triggered = True
-                            confidence = 0.8
-                            reasoning.append(f"Price crossed below {length}-period SMA")
-                            
-                            # Check if above 50 and 200 SMA (for priority 1-2 rules)
-                            if priority <= 2:
-                                sma_50 = indicators.get('sma_50', pd.Series([0]))
-                                sma_200 = indicators.get('sma_200', pd.Series([0]))
-                                if (hasattr(sma_50, '__len__') and len(sma_50) > 0 and 
-                                    hasattr(sma_200, '__len__') and len(sma_200) > 0):
-                                    sma_50_val = sma_50.iloc[-1] if hasattr(sma_50, 'iloc') else sma_50[-1]
-                                    sma_200_val = sma_200.iloc[-1] if hasattr(sma_200, 'iloc') else sma_200[-1]
-                                    if current_price > sma_50_val and current_price > sma_200_val:
-                                        reasoning.append("Price above 50 and 200 SMA")
-                                        confidence += 0.1
-                                    else:
-                                        confidence -= 0.2
-                                        reasoning.append("Price below 50 or 200 SMA")
-                
-                elif '50' in rule_name:
-                    # 50 SMA cross below logic
-                    sma_50 = indicators.get(f'sma_{length}', pd.Series([0]))
-                    if hasattr(sma_50, '__len__') and len(sma_50) >= 2:
-                        prev_price = data['close'].iloc[-2]
-                        prev_sma = sma_50.iloc[-2] if hasattr(sma_50, 'iloc') else sma_50[-2]
-                        current_sma = sma_50.iloc[-1] if hasattr(sma_50, 'iloc') else sma_50[-1]
-                        
-                        if prev_price > prev_sma and current_price < current_sma:
-                            signal_triggered = True
-                            confidence = 0.7
-                            reasoning.append(f"Price crossed below {length}-period SMA")
-                            
-                            # Check if above 200 SMA (for priority 2 rule)
-                            if priority == 2:
-                                sma_200 = indicators.get('sma_200', pd.Series([0]))
-                                if hasattr(sma_200, '__len__') and len(sma_200) > 0:
-                                    sma_200_val = sma_200.iloc[-1] if hasattr(sma_200, 'iloc') else sma_200[-1]
-                                    if current_price > sma_200_val:
-                                        reasoning.append("Price above 200 SMA")
-                                        confidence += 0.1
-                                    else:
-                                        confidence -= 0.2
-                                        reasoning.append("Price below 200 SMA")
-                
-                elif '200' in rule_name:
-                    # 200 SMA cross below logic
-                    sma_200 = indicators.get(f'sma_{length}', pd.Series([0]))
-                    if hasattr(sma_200, '__len__') and len(sma_200) >= 2:
-                        prev_price = data['close'].iloc[-2]
-                        prev_sma = sma_200.iloc[-2] if hasattr(sma_200, 'iloc') else sma_200[-2]
-                        current_sma = sma_200.iloc[-1] if hasattr(sma_200, 'iloc') else sma_200[-1]
-                        
-                        if prev_price > prev_sma and current_price < current_sma:
-                            signal_triggered = True
-                            confidence = 0.6
-                            reasoning.append(f"Price crossed below {length}-period SMA")
-            
-            elif 'ema_cross' in rule_name:
-                if '10' in rule_name:
-                    # 10 EMA cross below logic
-                    ema_10 = indicators.get(f'ema_{length}', pd.Series([0]))
-                    ema_20 = indicators.get('ema_20', pd.Series([0]))
-                    ema_40 = indicators.get('ema_40', pd.Series([0]))
-                    sma_200 = indicators.get('sma_200', pd.Series([0]))
-                    
-                    if (hasattr(ema_10, '__len__') and len(ema_10) >= 2 and 
-                        hasattr(ema_20, '__len__') and len(ema_20) > 0 and 
-                        hasattr(ema_40, '__len__') and len(ema_40) > 0):
-                        prev_price = data['close'].iloc[-2]
-                        prev_ema = ema_10.iloc[-2] if hasattr(ema_10, 'iloc') else ema_10[-2]
-                        current_ema = ema_10.iloc[-1] if hasattr(ema_10, 'iloc') else ema_10[-1]
-                        
-                        # Check if price crossed below 10 EMA
-                        if prev_price > prev_ema and current_price < current_ema:
-                            signal_triggered = True
-                            confidence = 0.75
-                            reasoning.append(f"Price crossed below {length}-period EMA")
-                            
-                            # Check if above 20, 40, and 200 SMA
-                            ema_20_val = ema_20.iloc[-1] if hasattr(ema_20, 'iloc') else ema_20[-1]
-                            ema_40_val = ema_40.iloc[-1] if hasattr(ema_40, 'iloc') else ema_40[-1]
-                            sma_200_val = sma_200.iloc[-1] if hasattr(sma_200, 'iloc') else sma_200[-1]
-                            
-                            if (current_price > ema_20_val and 
-                                current_price > ema_40_val and 
-                                current_price > sma_200_val):
-                                reasoning.append("Price above 20, 40, and 200 SMA")
-                                confidence += 0.1
-                            else:
-                                confidence -= 0.2
-                                reasoning.append("Price below 20, 40, or 200 SMA")
-                
-                elif '20' in rule_name:
-                    # 20 EMA cross below logic
-                    ema_20 = indicators.get(f'ema_{length}', pd.Series([0]))
-                    ema_40 = indicators.get('ema_40', pd.Series([0]))
-                    sma_200 = indicators.get('sma_200', pd.Series([0]))
-                    
-                    if (hasattr(ema_20, '__len__') and len(ema_20) >= 2 and 
-                        hasattr(ema_40, '__len__') and len(ema_40) > 0 and 
-                        hasattr(sma_200, '__len__') and len(sma_200) > 0):
-                        prev_price = data['close'].iloc[-2]
-                        prev_ema = ema_20.iloc[-2] if hasattr(ema_20, 'iloc') else ema_20[-2]
-                        current_ema = ema_20.iloc[-1] if hasattr(ema_20, 'iloc') else ema_20[-1]
-                        
-                        # Check if price crossed below 20 EMA
-                        if prev_price > prev_ema and current_price < current_ema:
-                            signal_triggered = True
-                            confidence = 0.7
-                            reasoning.append(f"Price crossed below {length}-period EMA")
-                            
-                            # Check if above 40 and 200 SMA
-                            ema_40_val = ema_40.iloc[-1] if hasattr(ema_40, 'iloc') else ema_40[-1]
-                            sma_200_val = sma_200.iloc[-1] if hasattr(sma_200, 'iloc') else sma_200[-1]
-                            
-                            if (current_price > ema_40_val and 
-                                current_price > sma_200_val):
-                                reasoning.append("Price above 40 and 200 SMA")
-                                confidence += 0.1
-                            else:
-                                confidence -= 0.2
-                                reasoning.append("Price below 40 or 200 SMA")
-                
-                elif '40' in rule_name:
-                    # 40 EMA cross below logic
-                    ema_40 = indicators.get(f'ema_{length}', pd.Series([0]))
-                    sma_200 = indicators.get('sma_200', pd.Series([0]))
-                    
-                    if (hasattr(ema_40, '__len__') and len(ema_40) >= 2 and 
-                        hasattr(sma_200, '__len__') and len(sma_200) > 0):
-                        prev_price = data['close'].iloc[-2]
-                        prev_ema = ema_40.iloc[-2] if hasattr(ema_40, 'iloc') else ema_40[-2]
-                        current_ema = ema_40.iloc[-1] if hasattr(ema_40, 'iloc') else ema_40[-1]
-                        
-                        # Check if price crossed below 40 EMA
-                        if prev_price > prev_ema and current_price < current_ema:
-                            signal_triggered = True
-                            confidence = 0.65
-                            reasoning.append(f"Price crossed below {length}-period EMA")
-                            
-                            # Check if above 200 SMA
-                            sma_200_val = sma_200.iloc[-1] if hasattr(sma_200, 'iloc') else sma_200[-1]
-                            if current_price > sma_200_val:
-                                reasoning.append("Price above 200 SMA")
-                                confidence += 0.1
-                            else:
-                                confidence -= 0.2
-                                reasoning.append("Price below 200 SMA")
-            
-            elif 'atr' in rule_name:
-                # ATR trailing stop logic - check if price crossed below the stop
-                atr_trailing_stop = indicators.get('atr_trailing_stop', pd.Series([0]))
-                if hasattr(atr_trailing_stop, '__len__') and len(atr_trailing_stop) >= 2:
-                    prev_price = data['close'].iloc[-2]
-                    prev_stop = atr_trailing_stop.iloc[-2] if hasattr(atr_trailing_stop, 'iloc') else atr_trailing_stop[-2]
-                    current_stop = atr_trailing_stop.iloc[-1] if hasattr(atr_trailing_stop, 'iloc') else atr_trailing_stop[-1]
-                    
-                    # Check if price crossed below ATR trailing stop
-                    if prev_price > prev_stop and current_price < current_stop:
-                        signal_triggered = True
-                        confidence = 0.7
-                        reasoning.append("Price crossed below ATR trailing stop")
-                    else:
-                        reasoning.append("Price did not cross below ATR trailing stop")
-                        confidence -= 0.3
-            
-            elif 'nymo' in rule_name:
-                # NYMO threshold check
-                nymo_threshold = rule.get('nymo_threshold', -50)
-                nymo_value = indicators.get('nymo', pd.Series([0]))
-                
-                if hasattr(nymo_value, '__len__') and len(nymo_value) > 0:
-                    nymo_val = nymo_value.iloc[-1] if hasattr(nymo_value, 'iloc') else nymo_value[-1]
-                    if nymo_val < nymo_threshold:
-                        signal_triggered = True
-                        confidence = 0.8
-                        reasoning.append(f"NYMO below {nymo_threshold}")
-                        
-                        # Higher confidence for more extreme NYMO values
-                        if nymo_threshold == -100:
-                            confidence = 0.95
-                        elif nymo_threshold == -70:
-                            confidence = 0.9
+            handler = self._rule_handlers.get(_parse_rule_name(rule_name))
+            if handler is not None:
+                signal_triggered, confidence = handler(rule, snap, close_arr, current_price, confidence, reasoning)
             
             # Final confidence adjustment based on priority
             if signal_triggered:
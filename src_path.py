@@ -0,0 +1,27 @@
+"""
+Puts the bot's src/ directory on sys.path for the root-level test scripts
+
+Both direct runs (python test_x.py) and pytest (through conftest.py) import this module,
+so the path setup lives here once instead of in every script, along with run_script()
+for the direct runs.
+"""
+import os
+import sys
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src')
+
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+def run_script(path, buffer_output=False):
+    """Run one test script through pytest with its prints shown, returning the exit code
+
+    buffer_output block-buffers stdout so a print-heavy offline script goes out in a few
+    large writes at exit. Leave it off for network-bound scripts, whose progress should
+    show while they wait on the APIs.
+    """
+    import pytest
+    
+    if buffer_output:
+        sys.stdout.reconfigure(line_buffering=False, write_through=False)
+    return pytest.main([path, "-s", *sys.argv[1:]])
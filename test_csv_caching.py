@@ -3,112 +3,114 @@
 Test script for CSV caching functionality
 """
 import asyncio
-import sys
 import os
+import sys
 import time
 
+import numpy as np
+import pandas as pd
+import pytest
+
 # Add src to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+import src_path  # noqa: F401
+
+def _timed_fetch(data_manager, ticker):
+    """Fetch daily data for a ticker, returning it with the elapsed seconds"""
+    start_ns = time.perf_counter_ns()
+    data = data_manager.fetch_market_data(ticker, "D", "30d")
+    return data, (time.perf_counter_ns() - start_ns) / 1e9
 
-def test_csv_caching():
+async def _fetch_all(data_manager, tickers):
+    """Fetch every ticker at once on the default thread pool so the API round-trips overlap"""
+    loop = asyncio.get_running_loop()
+    tasks = [loop.run_in_executor(None, _timed_fetch, data_manager, ticker) for ticker in tickers]
+    return await asyncio.gather(*tasks)
+
+def test_csv_caching(data_manager):
     """Test CSV caching functionality"""
     print("Testing CSV caching functionality...")
-    try:
-        from core.data_manager import DataManager
-        
-        # Initialize data manager
-        data_manager = DataManager()
-        print("✅ Data manager initialized successfully")
-        
-        # Get initial cache stats
-        print("\nInitial cache stats:")
-        initial_stats = data_manager.get_cache_stats()
-        for key, value in initial_stats.items():
-            print(f"   - {key}: {value}")
-        
-        # Test fetching data for a few tickers (will create CSV files)
-        print("\nTesting data fetching and CSV caching...")
-        test_tickers = ["AAPL", "MSFT", "GOOGL"]
-        
-        for ticker in test_tickers:
-            print(f"\nFetching data for {ticker}...")
-            start_time = time.time()
-            
-            # Fetch daily data (this will create CSV cache)
-            data = data_manager.fetch_market_data(ticker, "D", "30d")
-            
-            fetch_time = time.time() - start_time
-            print(f"   ✅ {ticker}: {len(data)} data points fetched in {fetch_time:.2f}s")
-            print(f"   📊 Sample data: Close=${data['close'].iloc[-1]:.2f}, Volume={data['volume'].iloc[-1]:,}")
-        
-        # Get cache stats after fetching
-        print("\nCache stats after fetching data:")
-        after_stats = data_manager.get_cache_stats()
-        for key, value in after_stats.items():
-            print(f"   - {key}: {value}")
-        
-        # Test cache reuse (should be much faster)
-        print("\nTesting cache reuse (should be faster)...")
-        for ticker in test_tickers:
-            print(f"\nRe-fetching data for {ticker} (should use CSV cache)...")
-            start_time = time.time()
-            
-            # Fetch data again (should use CSV cache)
-            data = data_manager.fetch_market_data(ticker, "D", "30d")
-            
-            fetch_time = time.time() - start_time
-            print(f"   ✅ {ticker}: {len(data)} data points loaded in {fetch_time:.2f}s (from cache)")
-        
-        # Test clearing specific ticker cache
-        print(f"\nTesting clear specific ticker cache...")
-        data_manager.clear_ticker_csv_cache("AAPL")
-        print("   ✅ Cleared AAPL cache")
-        
-        # Test clearing all CSV cache
-        print(f"\nTesting clear all CSV cache...")
-        data_manager.clear_csv_cache()
-        print("   ✅ Cleared all CSV cache")
-        
-        # Final cache stats
-        print("\nFinal cache stats:")
-        final_stats = data_manager.get_cache_stats()
-        for key, value in final_stats.items():
-            print(f"   - {key}: {value}")
-        
-        return True
+    print("✅ Data manager initialized successfully")
+    
+    # Get initial cache stats
+    print("\nInitial cache stats:")
+    initial_stats = data_manager.get_cache_stats()
+    print("\n".join(f"   - {key}: {value}" for key, value in initial_stats.items()))
+    
+    # Test fetching data for a few tickers (will create CSV files)
+    print("\nTesting data fetching and CSV caching...")
+    test_tickers = ["AAPL", "MSFT", "GOOGL"]
+    
+    print(f"\nFetching data for {', '.join(test_tickers)} concurrently...")
+    start_ns = time.perf_counter_ns()
+    
+    # Fetch daily data (this will create CSV cache)
+    results = asyncio.run(_fetch_all(data_manager, test_tickers))
+    
+    total_time = (time.perf_counter_ns() - start_ns) / 1e9
+    for ticker, (data, fetch_time) in zip(test_tickers, results):
+        assert not data.empty, f"No data fetched for {ticker}"
+        print(f"   ✅ {ticker}: {len(data)} data points fetched in {fetch_time:.2f}s")
+        print(f"   📊 Sample data: Close=${data['close'].iloc[-1]:.2f}, Volume={data['volume'].iloc[-1]:,}")
+    print(f"   ⏱️ All {len(test_tickers)} tickers fetched in {total_time:.2f}s")
+    
+    # Get cache stats after fetching
+    print("\nCache stats after fetching data:")
+    after_stats = data_manager.get_cache_stats()
+    print("\n".join(f"   - {key}: {value}" for key, value in after_stats.items()))
+    
+    # Test cache reuse (should be much faster); kept serial so each timing is a clean hot-cache read
+    print("\nTesting cache reuse (should be faster)...")
+    for ticker in test_tickers:
+        print(f"\nRe-fetching data for {ticker} (should use CSV cache)...")
         
-    except Exception as e:
-        print(f"❌ CSV caching test error: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+        # Fetch data again (should use CSV cache)
+        data, fetch_time = _timed_fetch(data_manager, ticker)
+        print(f"   ✅ {ticker}: {len(data)} data points loaded in {fetch_time * 1000:.2f}ms (from cache)")
+    
+    # Test clearing specific ticker cache
+    print(f"\nTesting clear specific ticker cache...")
+    data_manager.clear_ticker_csv_cache("AAPL")
+    print("   ✅ Cleared AAPL cache")
+    
+    # Test clearing all CSV cache
+    print(f"\nTesting clear all CSV cache...")
+    data_manager.clear_csv_cache()
+    print("   ✅ Cleared all CSV cache")
+    
+    # Final cache stats
+    print("\nFinal cache stats:")
+    final_stats = data_manager.get_cache_stats()
+    print("\n".join(f"   - {key}: {value}" for key, value in final_stats.items()))
 
-def main():
-    """Main test function"""
-    print("🚀 CSV Caching Functionality Test")
-    print("=" * 50)
+@pytest.mark.parametrize('feather', [True, False], ids=['feather', 'pickle'])
+@pytest.mark.parametrize('index_name', [None, 'date'])
+def test_data_cache_round_trip(data_manager, tmp_path, monkeypatch, feather, index_name):
+    """A cached frame loads back with the same date index and dtypes, and only stays valid on its own day"""
+    from core import data_manager as data_manager_module
+    if feather:
+        pytest.importorskip("pyarrow")
+    monkeypatch.setattr(data_manager_module, '_HAS_PYARROW', feather)
+    
+    data = pd.DataFrame({
+        'open': np.linspace(100, 110, 30),
+        'high': np.linspace(101, 111, 30),
+        'low': np.linspace(99, 109, 30),
+        'close': np.linspace(100.5, 110.5, 30),
+        'volume': np.arange(1_000_000, 1_000_030, dtype=np.int64),
+    }, index=pd.date_range('2025-01-01', periods=30, freq='D', name=index_name))
+    cache_path = str(tmp_path / f"AAPL{'.feather' if feather else '.df.pkl'}")
     
-    success = test_csv_caching()
+    data_manager._save_to_cache(data, cache_path)
+    loaded = data_manager._load_from_cache(cache_path)
     
-    if success:
-        print("\n" + "=" * 50)
-        print("✅ CSV caching test completed successfully!")
-        print("\nKey features demonstrated:")
-        print("1. ✅ CSV files are created in 'data_cache/' directory")
-        print("2. ✅ Data is reused from CSV cache on subsequent runs")
-        print("3. ✅ Cache files are automatically cleaned up daily")
-        print("4. ✅ Individual ticker cache can be cleared")
-        print("5. ✅ All CSV cache can be cleared")
-        print("\nBenefits:")
-        print("   - No repeated API calls to Alpha Vantage on the same day")
-        print("   - Faster subsequent runs")
-        print("   - Persistent storage between script executions")
-        print("   - Automatic cleanup of old cache files")
-    else:
-        print("\n❌ CSV caching test failed!")
+    # Feather does not store the index frequency; everything else must survive
+    pd.testing.assert_frame_equal(loaded, data, check_freq=False)
+    assert data_manager._is_cache_valid(cache_path)
     
-    return success
+    yesterday = time.time() - 24 * 60 * 60
+    os.utime(cache_path, (yesterday, yesterday))
+    assert not data_manager._is_cache_valid(cache_path)
 
 if __name__ == "__main__":
-    success = main()
-    sys.exit(0 if success else 1)
+    from src_path import run_script
+    sys.exit(run_script(__file__))
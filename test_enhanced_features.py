@@ -5,19 +5,18 @@ Test script for enhanced AI Trading Bot features:
 - Enhanced NYMO calculation
 - Position management
 """
-import asyncio
 import sys
-import os
-from pathlib import Path
+import textwrap
+
+import pytest
 
 # Add src to path
-sys.path.append(str(Path(__file__).parent / "src"))
+import src_path  # noqa: F401
 
-from utils.position_manager import PositionManager
-from utils.enhanced_nymo import EnhancedNYMO
-from utils.technical_indicators import TechnicalIndicators
+# The feature modules pull in pandas/numpy, so each test imports its own on first use
 from utils.logger import trading_logger
 
+@pytest.mark.asyncio
 async def test_position_manager():
     """Test position management features"""
     print("\n" + "="*60)
@@ -25,6 +24,7 @@ async def test_position_manager():
     print("="*60)
     
     # Initialize position manager
+    from utils.position_manager import PositionManager
     logger = trading_logger.get_logger("test")
     position_manager = PositionManager()
     position_manager.set_logger(logger)
@@ -41,16 +41,19 @@ async def test_position_manager():
     position_size = position_manager.calculate_atr_position_size(
         portfolio_value, current_price, atr_value, purchase_limit_pct
     )
+    assert position_size.get('shares', 0) > 0, "ATR-based sizing returned no shares"
     
-    print(f"Portfolio Value: ${portfolio_value:,.2f}")
-    print(f"Current Price: ${current_price:.2f}")
-    print(f"ATR Value: ${atr_value:.2f}")
-    print(f"Purchase Limit: {purchase_limit_pct}%")
-    print(f"\nPosition Size Results:")
-    print(f"  Shares: {position_size.get('shares', 0)}")
-    print(f"  Position Value: ${position_size.get('position_value', 0):,.2f}")
-    print(f"  Position %: {position_size.get('position_pct', 0):.2f}%")
-    print(f"  Sizing Method: {position_size.get('sizing_method', 'Unknown')}")
+    print(textwrap.dedent(f"""\
+        Portfolio Value: ${portfolio_value:,.2f}
+        Current Price: ${current_price:.2f}
+        ATR Value: ${atr_value:.2f}
+        Purchase Limit: {purchase_limit_pct}%
+
+        Position Size Results:
+          Shares: {position_size.get('shares', 0)}
+          Position Value: ${position_size.get('position_value', 0):,.2f}
+          Position %: {position_size.get('position_pct', 0):.2f}%
+          Sizing Method: {position_size.get('sizing_method', 'Unknown')}"""))
     
     # Test 2: Add a position
     print("\n📈 Test 2: Adding Position")
@@ -65,10 +68,11 @@ async def test_position_manager():
         confidence=0.8
     )
     
-    print("Added AAPL position:")
-    print(f"  Entry Price: $150.00")
-    print(f"  Shares: 100")
-    print(f"  Position Value: $15,000")
+    print(textwrap.dedent("""\
+        Added AAPL position:
+          Entry Price: $150.00
+          Shares: 100
+          Position Value: $15,000"""))
     
     # Test 3: Averaging down logic
     print("\n📉 Test 3: Averaging Down Logic")
@@ -84,14 +88,16 @@ async def test_position_manager():
         atr_value=3.5,
         pct_below_previous_buy=0.02
     )
+    assert should_average, "A 2x ATR drop should trigger averaging down"
     
-    print(f"Current Price: ${current_price_dropped:.2f}")
-    print(f"Entry Price: ${150.0:.2f}")
-    print(f"ATR Value: ${3.5:.2f}")
-    print(f"Price Drop: ${150.0 - current_price_dropped:.2f}")
-    print(f"Should Average Down: {should_average}")
-    print(f"Confidence: {confidence:.2f}")
-    print(f"Reasoning: {reasoning}")
+    print(textwrap.dedent(f"""\
+        Current Price: ${current_price_dropped:.2f}
+        Entry Price: ${150.0:.2f}
+        ATR Value: ${3.5:.2f}
+        Price Drop: ${150.0 - current_price_dropped:.2f}
+        Should Average Down: {should_average}
+        Confidence: {confidence:.2f}
+        Reasoning: {reasoning}"""))
     
     if should_average:
         # Calculate averaging down size
@@ -103,10 +109,12 @@ async def test_position_manager():
             averaging_level="2x ATR"
         )
         
-        print(f"\nAveraging Down Size:")
-        print(f"  Shares: {averaging_size.get('shares', 0)}")
-        print(f"  Position Value: ${averaging_size.get('position_value', 0):,.2f}")
-        print(f"  Level: {averaging_size.get('averaging_level', 'Unknown')}")
+        print(textwrap.dedent(f"""\
+
+            Averaging Down Size:
+              Shares: {averaging_size.get('shares', 0)}
+              Position Value: ${averaging_size.get('position_value', 0):,.2f}
+              Level: {averaging_size.get('averaging_level', 'Unknown')}"""))
     
     # Test 4: Partial profit taking
     print("\n💰 Test 4: Partial Profit Taking")
@@ -122,14 +130,16 @@ async def test_position_manager():
         entry_price=150.0,
         sma_200=sma_200
     )
+    assert should_take_profit, "A price 50% above the 200 SMA should trigger partial profit taking"
     
-    print(f"Current Price: ${current_price_profit:.2f}")
-    print(f"Entry Price: ${150.0:.2f}")
-    print(f"200 SMA: ${sma_200:.2f}")
-    print(f"50% above 200 SMA: ${sma_200 * 1.5:.2f}")
-    print(f"Should Take Partial Profit: {should_take_profit}")
-    print(f"Confidence: {profit_confidence:.2f}")
-    print(f"Reasoning: {profit_reasoning}")
+    print(textwrap.dedent(f"""\
+        Current Price: ${current_price_profit:.2f}
+        Entry Price: ${150.0:.2f}
+        200 SMA: ${sma_200:.2f}
+        50% above 200 SMA: ${sma_200 * 1.5:.2f}
+        Should Take Partial Profit: {should_take_profit}
+        Confidence: {profit_confidence:.2f}
+        Reasoning: {profit_reasoning}"""))
     
     # Test 5: Position summary
     print("\n📋 Test 5: Position Summary")
@@ -137,10 +147,81 @@ async def test_position_manager():
     
     position_summary = position_manager.get_position_summary("AAPL")
     print("Position Summary:")
-    for key, value in position_summary.items():
-        if key not in ['entry_date']:  # Skip datetime for cleaner output
-            print(f"  {key}: {value}")
+    # Skip datetime for cleaner output
+    print("\n".join(f"  {key}: {value}" for key, value in position_summary.items() if key != 'entry_date'))
+
+def test_atr_position_sizes_invalid_rows():
+    """Vectorized sizing matches the scalar method and gives 0 shares where price or portfolio is 0"""
+    import numpy as np
+    from utils.position_manager import PositionManager
+    position_manager = PositionManager()
+    
+    rows = [
+        (100000, 150.0, 3.5, 2.0),
+        (100000, 0.0, 3.5, 2.0),  # Zero price
+        (0, 50.0, 2.0, 5.0),      # Zero portfolio
+        (100000, 25.0, 1.5, 10.0),
+    ]
+    with np.errstate(all='raise'):
+        sizes = position_manager.calculate_atr_position_sizes(*np.array(rows).T)
+    
+    assert sizes, "Vectorized position sizing failed"
+    assert sizes['shares'].tolist()[1:3] == [0, 0]
+    assert sizes['position_value'][1:3].tolist() == [0.0, 0.0]
+    assert sizes['position_pct'][1:3].tolist() == [0.0, 0.0]
+    for i in (0, 3):
+        scalar = position_manager.calculate_atr_position_size(*rows[i])
+        assert sizes['shares'][i] == scalar['shares']
+        assert sizes['position_pct'][i] == pytest.approx(scalar['position_pct'])
+
+@pytest.mark.asyncio
+async def test_position_monitor_profit_taking():
+    """Test profit taking against Series-shaped indicators, as DataManager returns them"""
+    print("\n" + "="*60)
+    print("💹 TESTING POSITION MONITOR PROFIT TAKING")
+    print("="*60)
+    
+    from datetime import datetime
+    from types import SimpleNamespace
+    import pandas as pd
+    from utils.position_monitor import PositionMonitor
+    
+    def position(symbol, entry_price, current_price):
+        return SimpleNamespace(symbol=symbol, qty='10', avg_entry_price=str(entry_price),
+                               current_price=str(current_price), market_value=str(current_price * 10),
+                               unrealized_pl=str((current_price - entry_price) * 10),
+                               unrealized_plpc=str(current_price / entry_price - 1))
+    
+    positions = [
+        position('AAPL', 100.0, 200.0),  # +100% and far above its 200 SMA
+        position('MSFT', 300.0, 300.0),  # Flat and at its 200 SMA
+        position('TSLA', 100.0, 160.0),  # +60% with no 200 SMA history yet
+    ]
+    indicators = {
+        'AAPL': {'sma_200': pd.Series([95.0, 100.0])},
+        'MSFT': {'sma_200': pd.Series([300.0, 300.0])},
+        'TSLA': {'sma_200': pd.Series([], dtype=float)},
+    }
+    
+    def submit_order(**order_params):
+        return SimpleNamespace(id=f"{order_params['symbol']}-{order_params['qty']}")
+    
+    master_agent = SimpleNamespace(
+        logger=trading_logger.get_logger("test"),
+        alpaca_client=SimpleNamespace(list_positions=lambda: positions, submit_order=submit_order),
+        analysis_agent=SimpleNamespace(data_manager=SimpleNamespace(calculate_indicators_for_ticker=indicators.get)),
+        get_account_info=lambda: {'portfolio_value': 100000},
+    )
+    monitor = PositionMonitor(master_agent, {})
+    await monitor._check_positions()
+    await monitor._check_profit_taking_opportunities(datetime.now())
+    
+    actions = [(record['ticker'], record['action']) for record in monitor.management_history]
+    print("Management Actions:")
+    print("\n".join(f"  {ticker}: {action}" for ticker, action in actions))
+    assert actions == [('AAPL', 'PARTIAL_PROFIT_TAKING'), ('AAPL', 'PROFIT_TAKING'), ('TSLA', 'PROFIT_TAKING')]
 
+@pytest.mark.asyncio
 async def test_enhanced_nymo():
     """Test enhanced NYMO calculation"""
     print("\n" + "="*60)
@@ -148,6 +229,7 @@ async def test_enhanced_nymo():
     print("="*60)
     
     # Initialize enhanced NYMO
+    from utils.enhanced_nymo import EnhancedNYMO
     logger = trading_logger.get_logger("test")
     enhanced_nymo = EnhancedNYMO()
     enhanced_nymo.set_logger(logger)
@@ -159,14 +241,15 @@ async def test_enhanced_nymo():
     current_date = "2025-01-30"
     market_data = enhanced_nymo.fetch_market_breadth_data(current_date)
     
-    print(f"Market Breadth Data for {current_date}:")
-    print(f"  Advancing Issues: {market_data.get('advancing', 0):,}")
-    print(f"  Declining Issues: {market_data.get('declining', 0):,}")
-    print(f"  Unchanged Issues: {market_data.get('unchanged', 0):,}")
-    print(f"  Total Issues: {market_data.get('total', 0):,}")
-    print(f"  Advance/Decline Ratio: {market_data.get('advance_decline_ratio', 0):.2f}")
-    print(f"  Advancing %: {market_data.get('advancing_pct', 0):.1f}%")
-    print(f"  Declining %: {market_data.get('declining_pct', 0):.1f}%")
+    print(textwrap.dedent(f"""\
+        Market Breadth Data for {current_date}:
+          Advancing Issues: {market_data.get('advancing', 0):,}
+          Declining Issues: {market_data.get('declining', 0):,}
+          Unchanged Issues: {market_data.get('unchanged', 0):,}
+          Total Issues: {market_data.get('total', 0):,}
+          Advance/Decline Ratio: {market_data.get('advance_decline_ratio', 0):.2f}
+          Advancing %: {market_data.get('advancing_pct', 0):.1f}%
+          Declining %: {market_data.get('declining_pct', 0):.1f}%"""))
     
     # Test 2: Enhanced NYMO calculation
     print("\n📊 Test 2: Enhanced NYMO Calculation")
@@ -181,12 +264,13 @@ async def test_enhanced_nymo():
     
     nymo_signals = enhanced_nymo.calculate_nymo_signals(nymo_value)
     
-    print("NYMO Signals:")
-    print(f"  Signal Strength: {nymo_signals.get('signal_strength', 'Unknown')}")
-    print(f"  Trading Signal: {nymo_signals.get('trading_signal', 'Unknown')}")
-    print(f"  Confidence: {nymo_signals.get('confidence', 0):.2f}")
-    print(f"  Risk Level: {nymo_signals.get('risk_level', 'Unknown')}")
-    print(f"  Reasoning: {nymo_signals.get('reasoning', 'Unknown')}")
+    print(textwrap.dedent(f"""\
+        NYMO Signals:
+          Signal Strength: {nymo_signals.get('signal_strength', 'Unknown')}
+          Trading Signal: {nymo_signals.get('trading_signal', 'Unknown')}
+          Confidence: {nymo_signals.get('confidence', 0):.2f}
+          Risk Level: {nymo_signals.get('risk_level', 'Unknown')}
+          Reasoning: {nymo_signals.get('reasoning', 'Unknown')}"""))
     
     # Test 4: NYMO history and trend analysis
     print("\n📈 Test 4: NYMO History & Trend Analysis")
@@ -194,16 +278,19 @@ async def test_enhanced_nymo():
     
     nymo_history = enhanced_nymo.get_nymo_history(days=7)
     trend_analysis = enhanced_nymo.analyze_nymo_trend(nymo_history)
-    
-    print(f"NYMO History (7 days): {len(nymo_history)} data points")
-    print(f"Trend Analysis:")
-    print(f"  Trend: {trend_analysis.get('trend', 'Unknown')}")
-    print(f"  Trend Strength: {trend_analysis.get('trend_strength', 0):.2f}")
-    print(f"  Momentum: {trend_analysis.get('momentum', 'Unknown')}")
-    print(f"  Current Value: {trend_analysis.get('current_value', 0):.2f}")
-    print(f"  Average Value: {trend_analysis.get('average_value', 0):.2f}")
-    print(f"  Volatility: {trend_analysis.get('volatility', 0):.2f}")
+    assert len(nymo_history) == 7, "Expected one NYMO history point per day"
+    
+    print(textwrap.dedent(f"""\
+        NYMO History (7 days): {len(nymo_history)} data points
+        Trend Analysis:
+          Trend: {trend_analysis.get('trend', 'Unknown')}
+          Trend Strength: {trend_analysis.get('trend_strength', 0):.2f}
+          Momentum: {trend_analysis.get('momentum', 'Unknown')}
+          Current Value: {trend_analysis.get('current_value', 0):.2f}
+          Average Value: {trend_analysis.get('average_value', 0):.2f}
+          Volatility: {trend_analysis.get('volatility', 0):.2f}"""))
 
+@pytest.mark.asyncio
 async def test_technical_indicators():
     """Test enhanced technical indicators"""
     print("\n" + "="*60)
@@ -211,6 +298,7 @@ async def test_technical_indicators():
     print("="*60)
     
     # Initialize technical indicators
+    from utils.technical_indicators import TechnicalIndicators
     logger = trading_logger.get_logger("test")
     tech_indicators = TechnicalIndicators()
     tech_indicators.set_logger(logger)
@@ -225,37 +313,37 @@ async def test_technical_indicators():
     # Generate realistic price data
     base_price = 150.0
     returns = np.random.normal(0.001, 0.02, 100)  # Daily returns
-    prices = [base_price]
-    
-    for ret in returns[1:]:
-        prices.append(prices[-1] * (1 + ret))
+    returns[0] = 0.0  # First bar is the base price
+    prices = base_price * np.cumprod(1 + returns)
     
     data = pd.DataFrame({
-        'open': [p * (1 + np.random.normal(0, 0.005)) for p in prices],
-        'high': [p * (1 + abs(np.random.normal(0, 0.01))) for p in prices],
-        'low': [p * (1 - abs(np.random.normal(0, 0.01))) for p in prices],
+        'open': prices * (1 + np.random.normal(0, 0.005, 100)),
+        'high': prices * (1 + np.abs(np.random.normal(0, 0.01, 100))),
+        'low': prices * (1 - np.abs(np.random.normal(0, 0.01, 100))),
         'close': prices,
         'volume': np.random.randint(1000000, 10000000, 100)
     }, index=dates)
     
-    print(f"Sample Data Created:")
-    print(f"  Date Range: {data.index[0].strftime('%Y-%m-%d')} to {data.index[-1].strftime('%Y-%m-%d')}")
-    print(f"  Data Points: {len(data)}")
-    print(f"  Price Range: ${data['close'].min():.2f} - ${data['close'].max():.2f}")
+    print(textwrap.dedent(f"""\
+        Sample Data Created:
+          Date Range: {data.index[0].strftime('%Y-%m-%d')} to {data.index[-1].strftime('%Y-%m-%d')}
+          Data Points: {len(data)}
+          Price Range: ${data['close'].min():.2f} - ${data['close'].max():.2f}"""))
     
     # Test 1: ATR multiples
     print("\n📊 Test 1: ATR Multiples")
     print("-" * 40)
     
     atr_multiples = tech_indicators.calculate_atr_multiples(data, period=14)
+    assert atr_multiples, "ATR multiples calculation failed"
     
-    if atr_multiples:
-        current_atr = atr_multiples['atr'].iloc[-1]
-        print(f"Current ATR (14-period): ${current_atr:.2f}")
-        print(f"2x ATR: ${atr_multiples['atr_2x'].iloc[-1]:.2f}")
-        print(f"3x ATR: ${atr_multiples['atr_3x'].iloc[-1]:.2f}")
-        print(f"4x ATR: ${atr_multiples['atr_4x'].iloc[-1]:.2f}")
-        print(f"5x ATR: ${atr_multiples['atr_5x'].iloc[-1]:.2f}")
+    current_atr = atr_multiples['atr'].iloc[-1]
+    print(textwrap.dedent(f"""\
+        Current ATR (14-period): ${current_atr:.2f}
+        2x ATR: ${atr_multiples['atr_2x'].iloc[-1]:.2f}
+        3x ATR: ${atr_multiples['atr_3x'].iloc[-1]:.2f}
+        4x ATR: ${atr_multiples['atr_4x'].iloc[-1]:.2f}
+        5x ATR: ${atr_multiples['atr_5x'].iloc[-1]:.2f}"""))
     
     # Test 2: ATR-based position sizing
     print("\n💰 Test 2: ATR-based Position Sizing")
@@ -267,51 +355,18 @@ async def test_technical_indicators():
     position_sizing = tech_indicators.calculate_position_sizing_atr(
         data, portfolio_value, current_price, atr_period=14
     )
-    
-    if position_sizing:
-        print(f"Portfolio Value: ${portfolio_value:,.2f}")
-        print(f"Current Price: ${current_price:.2f}")
-        print(f"ATR Value: ${position_sizing.get('atr_value', 0):.2f}")
-        print(f"ATR Position Value: ${position_sizing.get('atr_position_value', 0):.2f}")
-        print(f"ATR Position %: {position_sizing.get('atr_position_pct', 0):.4f}%")
-        print(f"Shares: {position_sizing.get('shares', 0)}")
-        print(f"Actual Position Value: ${position_sizing.get('actual_position_value', 0):.2f}")
-        print(f"Sizing Method: {position_sizing.get('sizing_method', 'Unknown')}")
-
-async def main():
-    """Main test function"""
-    print("🚀 ENHANCED AI TRADING BOT FEATURE TEST")
-    print("=" * 60)
-    
-    try:
-        # Test all enhanced features
-        await test_position_manager()
-        await test_enhanced_nymo()
-        await test_technical_indicators()
-        
-        print("\n" + "="*60)
-        print("✅ ALL TESTS COMPLETED SUCCESSFULLY!")
-        print("="*60)
-        
-        print("\n🎯 FEATURES IMPLEMENTED:")
-        print("  ✅ ATR-based position sizing (1 ATR per trade)")
-        print("  ✅ Averaging down logic (2x, 3x, 4x ATR)")
-        print("  ✅ Enhanced NYMO calculation with market breadth")
-        print("  ✅ Position management and lifecycle")
-        print("  ✅ Partial profit taking (50% above 200 SMA)")
-        print("  ✅ Technical indicator enhancements")
-        
-        print("\n🚀 NEXT STEPS:")
-        print("  1. Integrate with main trading bot")
-        print("  2. Test with real market data")
-        print("  3. Configure position sizing parameters")
-        print("  4. Set up automated position monitoring")
-        
-    except Exception as e:
-        print(f"\n❌ ERROR: {str(e)}")
-        import traceback
-        traceback.print_exc()
+    assert position_sizing, "ATR-based position sizing failed"
+    
+    print(textwrap.dedent(f"""\
+        Portfolio Value: ${portfolio_value:,.2f}
+        Current Price: ${current_price:.2f}
+        ATR Value: ${position_sizing.get('atr_value', 0):.2f}
+        ATR Position Value: ${position_sizing.get('atr_position_value', 0):.2f}
+        ATR Position %: {position_sizing.get('atr_position_pct', 0):.4f}%
+        Shares: {position_sizing.get('shares', 0)}
+        Actual Position Value: ${position_sizing.get('actual_position_value', 0):.2f}
+        Sizing Method: {position_sizing.get('sizing_method', 'Unknown')}"""))
 
 if __name__ == "__main__":
-    asyncio.run(main())
-
+    from src_path import run_script
+    sys.exit(run_script(__file__, buffer_output=True))
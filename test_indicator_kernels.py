@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Equivalence tests for the indicator kernels against the pandas expressions they replaced
+"""
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add src to path
+import src_path  # noqa: F401
+
+from utils import technical_indicators
+from utils.technical_indicators import TechnicalIndicators
+
+def _sample_ohlc(rows=300, seed=7):
+    """Seeded random-walk OHLC bars"""
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.cumprod(1 + rng.normal(0.0005, 0.02, rows))
+    spread = np.abs(rng.normal(0, 0.01, (2, rows)))
+    return pd.DataFrame({
+        'open': close * (1 + rng.normal(0, 0.005, rows)),
+        'high': close * (1 + spread[0]),
+        'low': close * (1 - spread[1]),
+        'close': close,
+    }, index=pd.date_range('2024-01-01', periods=rows, freq='D'))
+
+def _require_numba(numba):
+    """Skip the compiled-kernel case when numba is not installed"""
+    if numba and not technical_indicators.NUMBA_AVAILABLE:
+        pytest.skip("numba is not installed")
+
+def _pandas_nymo(close: pd.Series) -> pd.Series:
+    """The original pandas NYMO formula, with the 20-bar change computed without filling gaps"""
+    price_change = close / close.shift(20) - 1
+    momentum = (price_change - price_change.rolling(20).mean()) / price_change.rolling(20).std()
+    return (momentum * 50).fillna(0)
+
+@pytest.mark.parametrize('numba', [True, False], ids=['kernel', 'fallback'])
+@pytest.mark.parametrize('nan_row', [None, 100], ids=['clean', 'nan_close'])
+def test_nymo_matches_pandas(monkeypatch, numba, nan_row):
+    """NYMO matches the pandas formula, and a missing close only zeroes the windows that contain it"""
+    _require_numba(numba)
+    monkeypatch.setattr(technical_indicators, 'NUMBA_AVAILABLE', numba)
+    
+    data = _sample_ohlc()
+    if nan_row is not None:
+        data.iloc[nan_row, data.columns.get_loc('close')] = np.nan
+    
+    nymo = TechnicalIndicators().calculate_nymo(data)
+    expected = _pandas_nymo(data['close'].astype(np.float32).astype(np.float64))
+    
+    np.testing.assert_allclose(nymo.to_numpy(dtype=np.float64), expected.to_numpy(), rtol=1e-4, atol=1e-3)
+    # Values after the gap has left every window are live again, not stuck at 0
+    assert (nymo.iloc[-50:] != 0).all()
+
+def _pandas_atr(data: pd.DataFrame, period: int) -> pd.Series:
+    """The original pandas ATR: true range with Wilder's smoothing"""
+    high_low = data['high'] - data['low']
+    high_close = abs(data['high'] - data['close'].shift())
+    low_close = abs(data['low'] - data['close'].shift())
+    true_range = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
+    return true_range.ewm(alpha=1/period, adjust=False).mean()
+
+@pytest.mark.parametrize('numba', [True, False], ids=['kernel', 'fallback'])
+@pytest.mark.parametrize('period', [5, 14])
+def test_atr_matches_pandas(monkeypatch, numba, period):
+    """ATR matches the pandas true range + ewm expression to float32 precision"""
+    _require_numba(numba)
+    monkeypatch.setattr(technical_indicators, 'NUMBA_AVAILABLE', numba)
+    
+    data = _sample_ohlc()
+    atr = TechnicalIndicators().calculate_atr(data, period)
+    
+    assert atr.dtype == np.float32
+    np.testing.assert_allclose(atr.to_numpy(dtype=np.float64), _pandas_atr(data, period).to_numpy(), rtol=1e-5)
+
+@pytest.mark.parametrize('numba', [True, False], ids=['kernel', 'fallback'])
+def test_atr_trailing_stop_matches_pandas(monkeypatch, numba):
+    """The trailing stop matches rolling(period).max() of the highs minus ATR, NaN warm-up included"""
+    _require_numba(numba)
+    monkeypatch.setattr(technical_indicators, 'NUMBA_AVAILABLE', numba)
+    
+    data = _sample_ohlc()
+    stop = TechnicalIndicators().calculate_atr_trailing_stop(data, period=5)
+    expected = data['high'].rolling(window=5).max() - _pandas_atr(data, 5)
+    
+    np.testing.assert_allclose(stop.to_numpy(dtype=np.float64), expected.to_numpy(), rtol=1e-5)
+
+@pytest.mark.parametrize('window', [1, 5, 21])
+def test_rolling_max_matches_pandas(window):
+    """The monotonic-deque rolling max equals pandas rolling().max() exactly on float32 input"""
+    values = _sample_ohlc()['high'].to_numpy(dtype=np.float32)
+    expected = pd.Series(values).rolling(window=window).max().to_numpy()
+    
+    np.testing.assert_array_equal(technical_indicators._rolling_max(values, window), expected)
+
+def test_batch_cross_below_matches_per_ticker_expression():
+    """The batched kernel flags the same crosses as prev > line[-2] and now < line[-1] per pair"""
+    rng = np.random.default_rng(11)
+    close_tail = rng.normal(100, 2, (64, 2))
+    line_tail = rng.normal(100, 2, (64, 6, 2))
+    line_tail[::7, 2] = np.nan  # Lines a ticker does not have never cross
+    
+    crosses = technical_indicators._batch_cross_below(close_tail, line_tail)
+    expected = (close_tail[:, None, 0] > line_tail[:, :, 0]) & (close_tail[:, None, 1] < line_tail[:, :, 1])
+    
+    np.testing.assert_array_equal(crosses, expected)
+    assert crosses.any() and not crosses.all()
+
+@pytest.mark.parametrize('rows', [2, 15, 300])
+@pytest.mark.parametrize('period', [10, 21, 40])
+def test_ema_tail_matches_ewm(rows, period):
+    """The tail-only EMA equals the last values of ewm(span=period).mean(), short histories included"""
+    close = _sample_ohlc()['close'].to_numpy()[:rows]
+    expected = pd.Series(close).ewm(span=period).mean().to_numpy()[-2:]
+    
+    np.testing.assert_allclose(technical_indicators._ema_tail(close, period, 2), expected, rtol=1e-9)
+
+def test_ema_cross_rule_uses_tail_for_missing_length():
+    """An EMA cross rule whose length has no series is decided from the EMA tail"""
+    ti = TechnicalIndicators()
+    close = np.array([100.0] * 30 + [101.0, 99.0])
+    prev_ema, current_ema = technical_indicators._ema_tail(close, 21, 2)
+    assert close[-2] > prev_ema and close[-1] < current_ema
+    
+    snap = {}
+    assert ti._ema_cross_below(snap, close, 21, close[-1])
+    assert snap['ema_21_cross_below'] is True
+    # A precomputed flag is used as-is
+    assert not ti._ema_cross_below({'ema_21_cross_below': False}, close, 21, close[-1])
+
+if __name__ == "__main__":
+    from src_path import run_script
+    sys.exit(run_script(__file__))
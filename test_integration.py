@@ -4,313 +4,246 @@ Tests all enhanced features integrated with the main trading bot
 """
 import asyncio
 import sys
-import os
-from pathlib import Path
 import time
+import types
+
+import numpy as np
+import pandas as pd
+import pytest
 
 # Add src to path
-sys.path.append(str(Path(__file__).parent / "src"))
+import src_path  # noqa: F401
 
-from agents.master_agent import MasterAgent
-from utils.logger import trading_logger
-from utils.position_manager import PositionManager
-from utils.enhanced_nymo import EnhancedNYMO
+# Trading decisions the email report test starts from, read-only so no run can alter them
+SIMULATED_TRADING_DECISIONS = types.MappingProxyType({
+    'AAPL': {
+        'action': 'BUY',
+        'confidence': 0.8,
+        'reasoning': 'Strong technical signals with positive news sentiment',
+        'signal_correlation': {'rule_priority': 1}
+    },
+    'MSFT': {
+        'action': 'HOLD',
+        'confidence': 0.6,
+        'reasoning': 'Mixed signals, waiting for clearer direction',
+        'signal_correlation': {'rule_priority': 3}
+    }
+})
 
-async def test_full_integration():
+@pytest.mark.asyncio
+async def test_full_integration(master_agent):
     """Test full integration of all enhanced features"""
     print("\n" + "="*80)
     print("🚀 COMPREHENSIVE INTEGRATION TEST")
     print("="*80)
     
-    # Initialize logger
-    logger = trading_logger.get_logger("integration_test")
+    # Test 1: Master Agent (built fresh for this test by the master_agent fixture)
+    print("\n📋 Test 1: Initializing Master Agent")
+    print("-" * 50)
     
-    try:
-        # Test 1: Initialize Master Agent
-        print("\n📋 Test 1: Initializing Master Agent")
-        print("-" * 50)
-        
-        master_agent = MasterAgent("config/config.yaml")
-        print("✅ Master Agent initialized successfully")
-        
-        # Test 2: Test Enhanced NYMO Integration
-        print("\n📊 Test 2: Enhanced NYMO Integration")
-        print("-" * 50)
-        
-        nymo_results = await master_agent.enhanced_nymo.analyze_market_conditions()
-        print(f"NYMO Analysis Results: {nymo_results}")
-        
-        if nymo_results and 'nymo_value' in nymo_results:
-            print(f"✅ NYMO Value: {nymo_results['nymo_value']:.2f}")
-            print(f"✅ Market Condition: {nymo_results.get('market_condition', 'Unknown')}")
-        else:
-            print("⚠️  NYMO analysis returned incomplete results")
-        
-        # Test 3: Test Position Manager Integration
-        print("\n💰 Test 3: Position Manager Integration")
-        print("-" * 50)
-        
-        position_manager = master_agent.position_manager
-        
-        # Test ATR-based position sizing
-        portfolio_value = 100000
-        current_price = 150.0
-        atr_value = 3.5
-        purchase_limit_pct = 2.0
-        
-        position_size = position_manager.calculate_atr_position_size(
-            portfolio_value, current_price, atr_value, purchase_limit_pct
-        )
-        
-        print(f"Portfolio Value: ${portfolio_value:,.2f}")
-        print(f"Current Price: ${current_price:.2f}")
-        print(f"ATR Value: ${atr_value:.2f}")
-        print(f"Purchase Limit: {purchase_limit_pct}%")
-        print(f"Position Size: {position_size.get('shares', 0)} shares")
-        print(f"Sizing Method: {position_size.get('sizing_method', 'Unknown')}")
-        
-        # Test 4: Comprehensive Analysis Execution
-        print("\n🔍 Test 4: Comprehensive Analysis Execution")
-        print("-" * 50)
-        
-        print("Executing comprehensive analysis...")
-        start_time = time.time()
-        
-        analysis_results = await master_agent.execute_comprehensive_analysis()
-        
-        execution_time = time.time() - start_time
-        print(f"✅ Analysis completed in {execution_time:.2f} seconds")
-        
-        if analysis_results:
-            analysis_count = len(analysis_results.get('analysis', {}))
-            news_count = len(analysis_results.get('news', {}))
-            nymo_count = 1 if analysis_results.get('nymo') else 0
+    print("✅ Master Agent initialized successfully")
+    
+    # Test 2: Test Enhanced NYMO Integration
+    print("\n📊 Test 2: Enhanced NYMO Integration")
+    print("-" * 50)
+    
+    nymo_results = await master_agent.enhanced_nymo.analyze_market_conditions()
+    print(f"NYMO Analysis Results: {nymo_results}")
+    
+    if nymo_results and 'nymo_value' in nymo_results:
+        print(f"✅ NYMO Value: {nymo_results['nymo_value']:.2f}")
+        print(f"✅ Market Condition: {nymo_results.get('market_condition', 'Unknown')}")
+    else:
+        print("⚠️  NYMO analysis returned incomplete results")
+    
+    # Test 3: Test Position Manager Integration
+    print("\n💰 Test 3: Position Manager Integration")
+    print("-" * 50)
+    
+    position_manager = master_agent.position_manager
+    
+    # Test ATR-based position sizing
+    portfolio_value = 100000
+    current_price = 150.0
+    atr_value = 3.5
+    purchase_limit_pct = 2.0
+    
+    position_size = position_manager.calculate_atr_position_size(
+        portfolio_value, current_price, atr_value, purchase_limit_pct
+    )
+    
+    print(f"Portfolio Value: ${portfolio_value:,.2f}")
+    print(f"Current Price: ${current_price:.2f}")
+    print(f"ATR Value: ${atr_value:.2f}")
+    print(f"Purchase Limit: {purchase_limit_pct}%")
+    print(f"Position Size: {position_size.get('shares', 0)} shares")
+    print(f"Sizing Method: {position_size.get('sizing_method', 'Unknown')}")
+    
+    # Test 4: Comprehensive Analysis Execution
+    print("\n🔍 Test 4: Comprehensive Analysis Execution")
+    print("-" * 50)
+    
+    print("Executing comprehensive analysis...")
+    start_ns = time.perf_counter_ns()
+    
+    analysis_results = await master_agent.execute_comprehensive_analysis()
+    
+    execution_time = (time.perf_counter_ns() - start_ns) / 1e9
+    print(f"✅ Analysis completed in {execution_time:.2f} seconds")
+    
+    if analysis_results:
+        analysis_count = len(analysis_results.get('analysis', {}))
+        news_count = len(analysis_results.get('news', {}))
+        nymo_count = 1 if analysis_results.get('nymo') else 0
+        
+        print(f"✅ Analysis Results: {analysis_count} tickers")
+        print(f"✅ News Results: {news_count} tickers")
+        print(f"✅ NYMO Results: {nymo_count} market condition")
+    else:
+        print("⚠️  No analysis results returned")
+    
+    # Test 5: Position Management Opportunities
+    print("\n📈 Test 5: Position Management Opportunities")
+    print("-" * 50)
+    
+    opportunities = master_agent.check_position_management_opportunities()
+    print(f"✅ Found {len(opportunities)} position management opportunities")
+    
+    for opp in opportunities[:3]:  # Show first 3
+        print(f"  - {opp['ticker']}: {opp['action']} - {opp['reasoning']}")
+    
+    # Test 6: Trading Decision Generation
+    print("\n🎯 Test 6: Trading Decision Generation")
+    print("-" * 50)
+    
+    if analysis_results and 'analysis' in analysis_results:
+        # Test with first available ticker
+        tickers = list(analysis_results['analysis'].keys())
+        if tickers:
+            test_ticker = tickers[0]
+            print(f"Testing decision generation for {test_ticker}")
             
-            print(f"✅ Analysis Results: {analysis_count} tickers")
-            print(f"✅ News Results: {news_count} tickers")
-            print(f"✅ NYMO Results: {nymo_count} market condition")
-        else:
-            print("⚠️  No analysis results returned")
-        
-        # Test 5: Position Management Opportunities
-        print("\n📈 Test 5: Position Management Opportunities")
-        print("-" * 50)
-        
-        opportunities = master_agent.check_position_management_opportunities()
-        print(f"✅ Found {len(opportunities)} position management opportunities")
-        
-        for opp in opportunities[:3]:  # Show first 3
-            print(f"  - {opp['ticker']}: {opp['action']} - {opp['reasoning']}")
-        
-        # Test 6: Trading Decision Generation
-        print("\n🎯 Test 6: Trading Decision Generation")
-        print("-" * 50)
-        
-        if analysis_results and 'analysis' in analysis_results:
-            # Test with first available ticker
-            tickers = list(analysis_results['analysis'].keys())
-            if tickers:
-                test_ticker = tickers[0]
-                print(f"Testing decision generation for {test_ticker}")
-                
-                ticker_signals = analysis_results['analysis'][test_ticker].get('signals', [])
-                ticker_news = analysis_results['news'].get(test_ticker, {})
+            # Analysis results map each ticker to its signal list
+            ticker_signals = analysis_results['analysis'][test_ticker]
+            ticker_news = analysis_results['news'].get(test_ticker, {})
+            
+            if ticker_signals:
+                decision = await master_agent._generate_ai_decision(
+                    test_ticker, ticker_signals, ticker_news
+                )
                 
-                if ticker_signals:
-                    decision = await master_agent._generate_ai_decision(
-                        test_ticker, ticker_signals, ticker_news
-                    )
-                    
-                    if decision:
-                        print(f"✅ Decision generated: {decision.get('action', 'Unknown')}")
-                        print(f"✅ Confidence: {decision.get('confidence', 0):.2f}")
-                        print(f"✅ Reasoning: {decision.get('reasoning', 'No reason')[:100]}...")
-                    else:
-                        print("⚠️  No decision generated")
+                if decision:
+                    print(f"✅ Decision generated: {decision.get('action', 'Unknown')}")
+                    print(f"✅ Confidence: {decision.get('confidence', 0):.2f}")
+                    print(f"✅ Reasoning: {decision.get('reasoning', 'No reason')[:100]}...")
                 else:
-                    print(f"⚠️  No signals for {test_ticker}")
+                    print("⚠️  No decision generated")
             else:
-                print("⚠️  No tickers available for decision testing")
-        
-        # Test 7: Email Report Generation
-        print("\n📧 Test 7: Email Report Generation")
-        print("-" * 50)
-        
-        # Simulate some trading decisions for testing
-        master_agent.trading_decisions = {
-            'AAPL': {
-                'action': 'BUY',
-                'confidence': 0.8,
-                'reasoning': 'Strong technical signals with positive news sentiment',
-                'signal_correlation': {'rule_priority': 1}
-            },
-            'MSFT': {
-                'action': 'HOLD',
-                'confidence': 0.6,
-                'reasoning': 'Mixed signals, waiting for clearer direction',
-                'signal_correlation': {'rule_priority': 3}
-            }
-        }
-        
-        # Test email report generation (without sending)
-        try:
-            # This would normally send an email, but we'll just test the generation
-            print("✅ Email report generation tested (not sent)")
-        except Exception as e:
-            print(f"⚠️  Email report generation error: {e}")
-        
-        print("\n" + "="*80)
-        print("🎉 INTEGRATION TEST COMPLETED SUCCESSFULLY!")
-        print("="*80)
-        
-        return True
-        
+                print(f"⚠️  No signals for {test_ticker}")
+        else:
+            print("⚠️  No tickers available for decision testing")
+    
+    # Test 7: Email Report Generation
+    print("\n📧 Test 7: Email Report Generation")
+    print("-" * 50)
+    
+    # Simulate some trading decisions for testing; the copy keeps any changes local to this run
+    master_agent.trading_decisions = dict(SIMULATED_TRADING_DECISIONS)
+    
+    # Test email report generation (without sending)
+    try:
+        # This would normally send an email, but we'll just test the generation
+        print("✅ Email report generation tested (not sent)")
     except Exception as e:
-        print(f"\n❌ Integration test failed: {e}")
-        logger.error(f"Integration test failed", error=str(e))
-        return False
+        print(f"⚠️  Email report generation error: {e}")
+    
+    print("\n" + "="*80)
+    print("🎉 INTEGRATION TEST COMPLETED SUCCESSFULLY!")
+    print("="*80)
+
+def _last_value(series: pd.Series) -> float:
+    """Latest value of an indicator series, or 0 when it is missing or empty"""
+    try:
+        return float(series.iloc[-1])
+    except (AttributeError, IndexError):
+        return 0.0
 
-async def test_market_data_integration():
+@pytest.mark.asyncio
+@pytest.mark.network
+async def test_market_data_integration(master_agent):
     """Test integration with real market data"""
     print("\n" + "="*80)
     print("📊 MARKET DATA INTEGRATION TEST")
     print("="*80)
     
-    try:
-        master_agent = MasterAgent("config/config.yaml")
-        
-        # Test market data fetching
-        print("\n📈 Testing Market Data Integration")
-        print("-" * 50)
-        
-        # Get a few tickers to test
-        test_tickers = ['AAPL', 'MSFT', 'GOOGL']
+    # Test market data fetching
+    print("\n📈 Testing Market Data Integration")
+    print("-" * 50)
+    
+    # Get a few tickers to test
+    test_tickers = ['AAPL', 'MSFT', 'GOOGL']
+    
+    # Calculate every ticker's technical indicators at once so the data fetches overlap
+    data_manager = master_agent.analysis_agent.data_manager
+    results = await asyncio.gather(
+        *(asyncio.to_thread(data_manager.calculate_indicators_for_ticker, ticker) for ticker in test_tickers),
+        return_exceptions=True
+    )
+    
+    for ticker, indicators in zip(test_tickers, results):
+        print(f"\nTesting {ticker}:")
         
-        for ticker in test_tickers:
-            print(f"\nTesting {ticker}:")
+        assert not isinstance(indicators, Exception), f"Indicator calculation failed for {ticker}: {indicators}"
+        if indicators and isinstance(indicators, dict) and len(indicators) > 0:
+            print(f"  ✅ Technical indicators calculated")
             
-            # Test technical indicators calculation
-            indicators = master_agent.analysis_agent.data_manager.calculate_indicators_for_ticker(ticker)
+            sma_200_val = _last_value(indicators.get('sma_200'))
+            atr_val = _last_value(indicators.get('atr'))
+            ema_10_val = _last_value(indicators.get('ema_10'))
             
-            if indicators and isinstance(indicators, dict) and len(indicators) > 0:
-                print(f"  ✅ Technical indicators calculated")
-                
-                # Safely get indicator values
-                sma_200 = indicators.get('sma_200', pd.Series([0]))
-                atr = indicators.get('atr', pd.Series([0]))
-                ema_10 = indicators.get('ema_10', pd.Series([0]))
-                
-                # Handle pandas Series safely
-                sma_200_val = sma_200.iloc[-1] if hasattr(sma_200, 'iloc') and len(sma_200) > 0 else 0
-                atr_val = atr.iloc[-1] if hasattr(atr, 'iloc') and len(atr) > 0 else 0
-                ema_10_val = ema_10.iloc[-1] if hasattr(ema_10, 'iloc') and len(ema_10) > 0 else 0
-                
-                print(f"  ✅ SMA 200: {sma_200_val:.2f}")
-                print(f"  ✅ ATR: {atr_val:.2f}")
-                print(f"  ✅ EMA 10: {ema_10_val:.2f}")
-            else:
-                print(f"  ⚠️  No indicators for {ticker}")
-        
-        print("\n✅ Market data integration test completed")
-        return True
-        
-    except Exception as e:
-        print(f"\n❌ Market data integration test failed: {e}")
-        return False
+            print(f"  ✅ SMA 200: {sma_200_val:.2f}")
+            print(f"  ✅ ATR: {atr_val:.2f}")
+            print(f"  ✅ EMA 10: {ema_10_val:.2f}")
+        else:
+            print(f"  ⚠️  No indicators for {ticker}")
+    
+    print("\n✅ Market data integration test completed")
 
-async def test_position_sizing_configuration():
+def test_position_sizing_configuration(master_agent):
     """Test position sizing configuration"""
     print("\n" + "="*80)
     print("⚖️  POSITION SIZING CONFIGURATION TEST")
     print("="*80)
     
-    try:
-        master_agent = MasterAgent("config/config.yaml")
-        position_manager = master_agent.position_manager
-        
-        # Test different scenarios
-        scenarios = [
-            {'portfolio': 100000, 'price': 150, 'atr': 3.5, 'limit': 2.0, 'name': 'Conservative'},
-            {'portfolio': 100000, 'price': 50, 'atr': 2.0, 'limit': 5.0, 'name': 'Moderate'},
-            {'portfolio': 100000, 'price': 25, 'atr': 1.5, 'limit': 10.0, 'name': 'Aggressive'}
-        ]
-        
-        for scenario in scenarios:
-            print(f"\n📊 {scenario['name']} Scenario:")
-            print(f"  Portfolio: ${scenario['portfolio']:,.2f}")
-            print(f"  Price: ${scenario['price']:.2f}")
-            print(f"  ATR: ${scenario['atr']:.2f}")
-            print(f"  Limit: {scenario['limit']}%")
-            
-            position_size = position_manager.calculate_atr_position_size(
-                scenario['portfolio'],
-                scenario['price'],
-                scenario['atr'],
-                scenario['limit']
-            )
-            
-            if position_size:
-                print(f"  ✅ Shares: {position_size.get('shares', 0)}")
-                print(f"  ✅ Position Value: ${position_size.get('position_value', 0):,.2f}")
-                print(f"  ✅ Position %: {position_size.get('position_pct', 0):.2f}%")
-                print(f"  ✅ Method: {position_size.get('sizing_method', 'Unknown')}")
-            else:
-                print(f"  ❌ Position sizing failed")
-        
-        print("\n✅ Position sizing configuration test completed")
-        return True
-        
-    except Exception as e:
-        print(f"\n❌ Position sizing configuration test failed: {e}")
-        return False
-
-async def main():
-    """Main test function"""
-    print("🚀 Starting AI Trading Bot Integration Tests")
-    print("="*80)
+    position_manager = master_agent.position_manager
     
-    # Run all tests
-    tests = [
-        test_full_integration,
-        test_market_data_integration,
-        test_position_sizing_configuration
+    # Test different scenarios
+    scenarios = [
+        {'portfolio': 100000, 'price': 150, 'atr': 3.5, 'limit': 2.0, 'name': 'Conservative'},
+        {'portfolio': 100000, 'price': 50, 'atr': 2.0, 'limit': 5.0, 'name': 'Moderate'},
+        {'portfolio': 100000, 'price': 25, 'atr': 1.5, 'limit': 10.0, 'name': 'Aggressive'}
     ]
     
-    results = []
-    
-    for test in tests:
-        try:
-            result = await test()
-            results.append(result)
-        except Exception as e:
-            print(f"❌ Test {test.__name__} failed with exception: {e}")
-            results.append(False)
-    
-    # Summary
-    print("\n" + "="*80)
-    print("📋 INTEGRATION TEST SUMMARY")
-    print("="*80)
-    
-    passed = sum(results)
-    total = len(results)
-    
-    print(f"Tests Passed: {passed}/{total}")
-    print(f"Success Rate: {(passed/total)*100:.1f}%")
+    # Size every scenario in one vectorized call, one column per input
+    position_sizes = position_manager.calculate_atr_position_sizes(
+        *np.array([[s['portfolio'], s['price'], s['atr'], s['limit']] for s in scenarios]).T
+    )
+    assert position_sizes, "Position sizing failed"
     
-    if passed == total:
-        print("🎉 All integration tests passed! The bot is ready for production.")
-    else:
-        print("⚠️  Some tests failed. Please review the errors above.")
+    for i, scenario in enumerate(scenarios):
+        print(f"\n📊 {scenario['name']} Scenario:")
+        print(f"  Portfolio: ${scenario['portfolio']:,.2f}")
+        print(f"  Price: ${scenario['price']:.2f}")
+        print(f"  ATR: ${scenario['atr']:.2f}")
+        print(f"  Limit: {scenario['limit']}%")
+        
+        print(f"  ✅ Shares: {position_sizes['shares'][i]}")
+        print(f"  ✅ Position Value: ${position_sizes['position_value'][i]:,.2f}")
+        print(f"  ✅ Position %: {position_sizes['position_pct'][i]:.2f}%")
+        print(f"  ✅ Method: {position_sizes['sizing_method'][i]}")
     
-    return passed == total
+    print("\n✅ Position sizing configuration test completed")
 
 if __name__ == "__main__":
-    # Run the integration tests
-    success = asyncio.run(main())
-    
-    if success:
-        print("\n✅ Integration tests completed successfully!")
-        sys.exit(0)
-    else:
-        print("\n❌ Some integration tests failed!")
-        sys.exit(1)
+    from src_path import run_script
+    sys.exit(run_script(__file__))